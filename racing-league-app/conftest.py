@@ -0,0 +1,48 @@
+import os
+import uuid
+
+# Config reads these at import time
+os.environ.setdefault('ORIGINS', 'http://localhost')
+os.environ.setdefault('MONGO_DB_NAME', 'racing_league_test')
+
+import mongomock
+import pytest
+from pymongo import MongoClient
+import src.config.indexes as indexes
+import src.config.mongo as mongo
+from src.user_module.user import user_cache
+
+
+def _use_database(monkeypatch, database):
+    monkeypatch.setattr(mongo, 'get_db', lambda: database)
+    monkeypatch.setattr(indexes, 'get_db', lambda: database)
+    # Per-process state that would otherwise leak between databases
+    monkeypatch.setattr(indexes, '_required', {})
+    user_cache.clear()
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """In-memory database behind every `from src.config.mongo import db`"""
+    database = mongomock.MongoClient()['racing_league_test']
+    _use_database(monkeypatch, database)
+    return database
+
+
+@pytest.fixture
+def mongo_server(monkeypatch):
+    """
+    Throwaway database on the MongoDB 5.0+ server at MONGO_TEST_URI
+
+    For code mongomock cannot run, such as the $setField pipelines of
+    League.add_race_result; skipped when MONGO_TEST_URI is not set.
+    """
+    uri = os.environ.get('MONGO_TEST_URI')
+    if not uri:
+        pytest.skip("MONGO_TEST_URI is not set")
+    client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+    database = client[f"racing_league_test_{uuid.uuid4().hex[:12]}"]
+    _use_database(monkeypatch, database)
+    yield database
+    client.drop_database(database.name)
+    client.close()
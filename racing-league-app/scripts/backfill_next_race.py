@@ -0,0 +1,67 @@
+"""
+Backfill script for the materialized next race fields on league documents.
+
+Usage:
+    python scripts/backfill_next_race.py                # backfill once
+    python scripts/backfill_next_race.py --interval 300 # keep refreshing every 300 seconds
+
+This script will:
+1. Create the registered indexes, including leagues.next_race_at
+2. Compute next_race_id / next_race_at for every league missing them or holding
+   a next race that is already in the past
+
+Reads only use the stored fields, so a race whose date passes without results
+keeps its league out of next race queries until it is refreshed. The web app
+does that every NEXT_RACE_REFRESH_INTERVAL seconds; --interval is for
+deployments that set it to 0 and refresh from a separate process instead.
+
+The script is idempotent - leagues with an up to date next race are left untouched.
+"""
+
+import sys
+import os
+import time
+
+# Add the project root directory to the path so we can import our modules
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.config.mongo import db
+from src.config.indexes import ensure_indexes
+from src.league_module.league import League
+
+
+def backfill_next_race():
+    """Create the index and materialize the next race on every outdated league"""
+    ensure_indexes()
+    print("  ✓ Indexes ready")
+
+    updated = League.refresh_stale_next_races()
+
+    missing = db.leagues.count_documents({"next_race_at": {"$exists": False}})
+    print("\n" + "=" * 50)
+    print(f"Backfill complete!")
+    print(f"  Leagues updated: {updated}")
+    print(f"  Leagues without next race fields: {missing}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Materialize the next race on league documents')
+    parser.add_argument('--interval', type=int, help='Keep running, refreshing stale leagues every INTERVAL seconds')
+
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("League Next Race Backfill Script")
+    print("=" * 50 + "\n")
+    backfill_next_race()
+
+    if args.interval:
+        print(f"\nRefreshing stale next races every {args.interval} seconds")
+        while True:
+            time.sleep(args.interval)
+            updated = League.refresh_stale_next_races()
+            if updated:
+                print(f"Refreshed the next race of {updated} leagues")
@@ -0,0 +1,55 @@
+"""
+Backfill script for the per-race standings snapshots.
+
+Usage:
+    python scripts/backfill_standings_snapshots.py
+
+This script will:
+1. Create the registered indexes, including the unique
+   standings_snapshots (league, race_order) index
+2. Rebuild the snapshots of every league with race results from its stored results
+
+The script is idempotent - each league's snapshots are replaced as a whole.
+"""
+
+import sys
+import os
+
+# Add the project root directory to the path so we can import our modules
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.config.mongo import db
+from src.config.indexes import ensure_indexes
+from src.league_module.league import League
+from src.league_module.standings_snapshot import StandingsSnapshot
+
+
+def backfill_standings_snapshots():
+    """Rebuild the snapshots of every league that has race results"""
+    ensure_indexes()
+    print("  ✓ Indexes ready")
+
+    leagues = 0
+    snapshots = 0
+    for league_data in db.leagues.find({"standings.races": {"$exists": True}}):
+        league = League._create_league_from_document(league_data)
+        try:
+            count = StandingsSnapshot.rebuild(league)
+            leagues += 1
+            snapshots += count
+            print(f"  ✓ {league.name}: {count} snapshots")
+        except Exception as e:
+            print(f"  ✗ {league.name}: {str(e)}")
+
+    print("\n" + "=" * 50)
+    print(f"Backfill complete!")
+    print(f"  Leagues rebuilt: {leagues}")
+    print(f"  Snapshots written: {snapshots}")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Standings Snapshot Backfill Script")
+    print("=" * 50 + "\n")
+    backfill_standings_snapshots()
@@ -0,0 +1,55 @@
+"""
+Create the MongoDB indexes declared in src/config/indexes.py.
+
+Usage:
+    python scripts/ensure_indexes.py            # create missing indexes
+    python scripts/ensure_indexes.py --check    # also report queries planned as collection scans
+
+Creating indexes is idempotent - indexes that already exist are left untouched,
+so the script can run on every deploy. Duplicate pending invites, which would
+block the unique invite index, are retired first.
+"""
+
+import sys
+import os
+
+# Add the project root directory to the path so we can import our modules
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.config.indexes import dedupe_pending_invites, ensure_indexes, find_collection_scans
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Create registered MongoDB indexes')
+    parser.add_argument('--check', action='store_true', help='Report model queries that would do a collection scan')
+
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("MongoDB Index Registry")
+    print("=" * 50 + "\n")
+
+    retired = dedupe_pending_invites()
+    if retired:
+        print(f"  ✓ invites: retired {retired} duplicate pending invite(s)")
+
+    failed = False
+    for collection, result in ensure_indexes().items():
+        print(f"  ✓ {collection}: {', '.join(result['created'])}")
+        for error in result["errors"]:
+            failed = True
+            print(f"  ✗ {collection}: {error}")
+
+    if args.check:
+        print("\nChecking query plans...\n")
+        scans = find_collection_scans()
+        for collection, name in scans:
+            print(f"  ✗ {name} does a collection scan on '{collection}'")
+        if not scans:
+            print("  ✓ Every registered query uses an index")
+        failed = failed or bool(scans)
+
+    sys.exit(1 if failed else 0)
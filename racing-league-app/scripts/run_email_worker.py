@@ -0,0 +1,42 @@
+"""
+Standalone delivery worker for the email outbox.
+
+Usage:
+    python scripts/run_email_worker.py          # drain the outbox every EMAIL_WORKER_INTERVAL seconds
+    python scripts/run_email_worker.py --once   # deliver everything that is due, then exit
+
+Run exactly one of these per deployment next to the web processes; the web
+processes leave delivery to it unless EMAIL_WORKER_ENABLED=true. Set
+EMAIL_TRANSPORT=local to print emails instead of sending them.
+"""
+
+import sys
+import os
+import time
+
+# Add the project root directory to the path so we can import our modules
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.config.config import Config
+from src.email_module.email_worker import EmailWorker
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Deliver queued emails')
+    parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+
+    args = parser.parse_args()
+
+    worker = EmailWorker()
+    if args.once:
+        print(f"Delivered {worker.drain()} emails")
+    else:
+        print(f"Draining the email outbox every {Config.EMAIL_WORKER_INTERVAL} seconds")
+        while True:
+            sent = worker.drain()
+            if sent:
+                print(f"Delivered {sent} emails")
+            time.sleep(Config.EMAIL_WORKER_INTERVAL)
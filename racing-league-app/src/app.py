@@ -1,5 +1,5 @@
 # project/src/app.py
-from flask import Flask
+from flask import Flask, g
 from src.auth_module.auth_controller import auth_blueprint
 from src.check_alive_module.check_alive_controller import check_alive_blue_print
 from src.league_module.league_controller import league_blueprint
@@ -7,6 +7,9 @@ from src.invite_module.invite_controller import invite_blueprint
 from src.user_module.user_controller import user_blueprint
 from flask_cors import CORS
 from src.config.config import Config
+from src.config.indexes import ensure_indexes
+from src.email_module.email_worker import start_email_worker
+from src.league_module.next_race_refresh import start_next_race_refresh
 # from src.check_alive_module.ping import start_scheduler
 
 # start_scheduler()
@@ -17,6 +20,21 @@ app.config.from_object(Config)
 # Initialize Firebase
 Config.init_firebase()
 
+# Create missing MongoDB indexes (scripts/ensure_indexes.py does the same on deploy)
+if Config.ENSURE_INDEXES_ON_STARTUP:
+    ensure_indexes()
+
+# Queued emails are delivered by scripts/run_email_worker.py running as its own process.
+# EMAIL_WORKER_ENABLED=true drains them in-process instead, e.g. for local development;
+# every gunicorn worker would then run its own drainer.
+if Config.EMAIL_WORKER_ENABLED:
+    start_email_worker()
+
+# Leagues whose next race passed without results are refreshed here rather than on
+# read; the refresh is idempotent, so running it in every gunicorn worker is harmless.
+if Config.NEXT_RACE_REFRESH_INTERVAL > 0:
+    start_next_race_refresh()
+
 # Register blueprints
 app.register_blueprint(auth_blueprint)
 app.register_blueprint(league_blueprint)
@@ -25,5 +43,15 @@ app.register_blueprint(user_blueprint)
 app.register_blueprint(check_alive_blue_print)
 
 
+@app.after_request
+def add_user_loader_stats(response):
+    """Expose how many user lookups the request served from its identity map"""
+    loader = g.get('user_loader')
+    if loader is not None:
+        stats = loader.stats()
+        response.headers['X-User-Loader'] = f"hits={stats['hits']}; misses={stats['misses']}"
+    return response
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -15,11 +15,13 @@ def login():
     if not email or not password:
         return jsonify({"message": "Email and password are required"}), 400
 
-    id_token, uid = AuthService.login_user(email, password)
-    user = User.get_user_by_mail(email)
+    try:
+        id_token, uid, user, email_verified = AuthService.login(email, password, User.get_user_by_mail)
+    except Exception:
+        return jsonify({"message": "Login failed. Please try again."}), 500
     if not user:
         return jsonify({"message": "User not found."}), 404
-    if not AuthService.check_email_verified(user.email):
+    if id_token and uid and not email_verified:
         return jsonify({"message": "Email not verified."}), 401
     if id_token and uid:
         # No longer creating a session
@@ -1,9 +1,22 @@
 # project/src/auth_module/auth_service.py
 from firebase_admin import auth
-from flask import session, request, jsonify
+from flask import session, request, jsonify, g
 import requests
+import hashlib
+import time
 from src.config.config import Config
+from src.cache_module.ttl_cache import TTLCache
+from src.auth_module.principal import Principal
+from src.auth_module.firebase_client import get_firebase_client
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+
+# Verified ID tokens, keyed by a SHA-256 of the token and kept until the token's exp
+token_cache = TTLCache(maxsize=Config.TOKEN_CACHE_SIZE, ttl=3600)
+# Runs the independent steps of a login concurrently
+login_executor = ThreadPoolExecutor(max_workers=Config.LOGIN_POOL_SIZE, thread_name_prefix="login")
+# Firebase user records for the few callers that need more than the token claims
+firebase_user_cache = TTLCache(maxsize=Config.FIREBASE_USER_CACHE_SIZE, ttl=Config.FIREBASE_USER_CACHE_TTL)
 
 
 def login_required(f):
@@ -15,7 +28,9 @@ def login_required(f):
 
         token = auth_header.split(' ')[1]
         try:
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = AuthService.verify_token(token)
+            # Keep the decoded token for the rest of the request
+            g.decoded_token = decoded_token
             # Store uid in request context for the route to use
             request.uid = decoded_token['user_id']
             return f(*args, **kwargs)
@@ -28,12 +43,89 @@ def login_required(f):
     return decorated_function
 
 class AuthService:
+
+    @staticmethod
+    def verify_token(id_token):
+        """
+        Verify a Firebase ID token and return its decoded claims
+
+        Verified tokens are cached per process until they expire, so the
+        signature is checked once per token instead of once per request.
+
+        Raises:
+            Exception: Whatever auth.verify_id_token raises for an invalid token
+        """
+        key = hashlib.sha256(id_token.encode('utf-8')).hexdigest()
+        decoded_token = token_cache.get(key)
+        if decoded_token is None:
+            decoded_token = auth.verify_id_token(id_token)
+            ttl = decoded_token.get('exp', 0) - time.time()
+            if ttl > 0:
+                token_cache.set(key, decoded_token, ttl=ttl)
+        return decoded_token
+
+    @staticmethod
+    def get_decoded_token():
+        """Decoded token of the current request, verified at most once per request"""
+        if 'decoded_token' in g:
+            return g.decoded_token
+
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return None
+
+        token = auth_header.split(' ')[1]
+        try:
+            g.decoded_token = AuthService.verify_token(token)
+        except Exception:
+            g.decoded_token = None
+        return g.decoded_token
+
+    @staticmethod
+    def get_current_principal():
+        """
+        Get the authenticated caller from the verified token's claims
+
+        Only tokens without an email claim (e.g. phone sign-in) fall back to a
+        cached Firebase user record.
+
+        Returns:
+            Principal, or None when the request carries no valid token
+        """
+        if 'principal' in g:
+            return g.principal
+
+        decoded_token = AuthService.get_decoded_token()
+        principal = Principal.from_token(decoded_token) if decoded_token else None
+        if principal and not principal.email:
+            record = AuthService.get_firebase_user(principal.uid)
+            principal.email = record.email
+            principal.email_verified = record.email_verified
+        g.principal = principal
+        return principal
+
+    @staticmethod
+    def get_firebase_user(uid):
+        """Get a Firebase user record, cached per process for FIREBASE_USER_CACHE_TTL seconds"""
+        record = firebase_user_cache.get(uid)
+        if record is None:
+            record = auth.get_user(uid)
+            firebase_user_cache.set(uid, record)
+        return record
+
+    @staticmethod
+    def token_cache_stats():
+        return token_cache.stats()
+
+    @staticmethod
+    def firebase_user_cache_stats():
+        return firebase_user_cache.stats()
     
     @staticmethod
     def verify_id_token(id_token):
         """Verify Firebase ID token"""
         try:
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = AuthService.verify_token(id_token)
             return decoded_token['user_id']
         except Exception as e:
             return None
@@ -42,16 +134,16 @@ class AuthService:
     def login_user(email, password):
         """Login a user by verifying their credentials using Firebase"""
         # Use Firebase's REST API to authenticate the user
-        api_key = Config.FIREBASE_API_KEY
-        url = f"{Config.FIREBASE_URL}/v1/accounts:signInWithPassword?key={api_key}"
-
         payload = {
             "email": email,
             "password": password,
             "returnSecureToken": True
         }
 
-        response = requests.post(url, json=payload)
+        try:
+            response = get_firebase_client().post("/v1/accounts:signInWithPassword", payload)
+        except requests.RequestException:
+            return None, None
 
         if response.status_code == 200:
             id_token = response.json().get("idToken")
@@ -60,6 +152,41 @@ class AuthService:
         else:
             return None, None
 
+    @staticmethod
+    def login(email, password, load_user):
+        """
+        Sign in with Firebase while the application user is loaded concurrently
+
+        Whether the email is verified is read from the claims of the returned ID
+        token, so a login costs one Firebase round trip plus one user lookup.
+
+        Args:
+            email: Login email
+            password: Login password
+            load_user: Callable loading the application user by email
+
+        Returns:
+            Tuple of (id_token, uid, user, email_verified); id_token and uid are
+            None when the credentials are invalid
+
+        Raises:
+            Exception: If the ID token Firebase just issued cannot be verified
+        """
+        sign_in = login_executor.submit(AuthService.login_user, email, password)
+        user_lookup = login_executor.submit(load_user, email)
+        id_token, uid = sign_in.result()
+        user = user_lookup.result()
+
+        email_verified = False
+        if id_token:
+            try:
+                email_verified = AuthService.verify_token(id_token).get('email_verified', False)
+            except Exception as e:
+                # Never hand out a token that cannot be verified
+                print(f"Failed to verify the ID token issued for {email}: {str(e)}")
+                raise
+        return id_token, uid, user, email_verified
+
     @staticmethod
     def check_email_verified(user_email):
         user = auth.get_user_by_email(user_email)
@@ -97,16 +224,10 @@ class AuthService:
     @staticmethod
     def get_current_user():
         """Get current user from the token in Authorization header"""
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return None
-
-        token = auth_header.split(' ')[1]
-        try:
-            decoded_token = auth.verify_id_token(token)
-            return decoded_token['user_id']
-        except:
+        decoded_token = AuthService.get_decoded_token()
+        if not decoded_token:
             return None
+        return decoded_token.get('user_id')
 
     @staticmethod
     def register_user(email, password):
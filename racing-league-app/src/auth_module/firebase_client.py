@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.config.config import Config
+
+
+class FirebaseRestClient:
+    """
+    Pooled, keep-alive HTTP client for the Firebase REST APIs.
+
+    One requests.Session per process keeps TLS connections to the identity
+    toolkit open between calls, applies connect/read timeouts and retries
+    connection errors and 5xx responses with exponential backoff.
+    """
+
+    def __init__(self, base_url, api_key, pool_size=10, connect_timeout=3.0, read_timeout=10.0, retries=2, backoff=0.3):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._errors = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def post(self, path, payload):
+        """
+        POST a JSON payload to a Firebase REST endpoint, e.g. "/v1/accounts:signInWithPassword"
+
+        Raises:
+            requests.RequestException: On connection failures or timeouts after retries
+        """
+        url = f"{self.base_url}{path}"
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.post(url, params={"key": self.api_key}, json=payload, timeout=self.timeout)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            self._record((time.perf_counter() - start) * 1000, failed)
+
+    def _record(self, elapsed_ms, failed):
+        with self._lock:
+            self._calls += 1
+            self._errors += 1 if failed else 0
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "errors": self._errors,
+                "avg_ms": round(self._total_ms / self._calls, 2) if self._calls else None,
+                "max_ms": round(self._max_ms, 2)
+            }
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_firebase_client():
+    """Get the process-wide client, creating a fresh one after a fork"""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = FirebaseRestClient(
+                base_url=Config.FIREBASE_URL,
+                api_key=Config.FIREBASE_API_KEY,
+                pool_size=Config.FIREBASE_HTTP_POOL_SIZE,
+                connect_timeout=Config.FIREBASE_HTTP_CONNECT_TIMEOUT,
+                read_timeout=Config.FIREBASE_HTTP_READ_TIMEOUT,
+                retries=Config.FIREBASE_HTTP_RETRIES,
+                backoff=Config.FIREBASE_HTTP_BACKOFF
+            )
+            _client_pid = os.getpid()
+        return _client
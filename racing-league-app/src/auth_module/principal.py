@@ -0,0 +1,23 @@
+class Principal:
+    """
+    Authenticated caller of the current request, built from the verified ID token.
+
+    Exposes the same uid/email/email_verified attributes handlers used to read
+    from the Firebase UserRecord returned by auth.get_user, without the network
+    round trip to Firebase.
+    """
+
+    def __init__(self, uid, email, email_verified=False, name=None):
+        self.uid = uid
+        self.email = email
+        self.email_verified = email_verified
+        self.name = name
+
+    @staticmethod
+    def from_token(decoded_token):
+        return Principal(
+            uid=decoded_token.get('user_id') or decoded_token.get('uid'),
+            email=decoded_token.get('email'),
+            email_verified=decoded_token.get('email_verified', False),
+            name=decoded_token.get('name')
+        )
@@ -1,7 +1,27 @@
 from flask import Blueprint, request, jsonify
+from src.user_module.user import User
+from src.auth_module.auth_service import AuthService, login_required
+from src.auth_module.firebase_client import get_firebase_client
+from src.config.config import Config
+from src.config.mongo import pool_stats
 
 check_alive_blue_print = Blueprint('check_alive', __name__, url_prefix='/api/v1/check')
 
 @check_alive_blue_print.route('', methods=['GET'])
 def check_alive():
-    return jsonify({"message": "Service is alive!"}), 200
\ No newline at end of file
+    return jsonify({"message": "Service is alive!"}), 200
+
+@login_required
+def process_stats():
+    """Per-process cache, HTTP and MongoDB pool statistics"""
+    return jsonify({
+        "user_cache": User.cache_stats(),
+        "token_cache": AuthService.token_cache_stats(),
+        "firebase_user_cache": AuthService.firebase_user_cache_stats(),
+        "firebase_http": get_firebase_client().stats(),
+        "mongo_pool": pool_stats()
+    }), 200
+
+# Process internals are only exposed where explicitly enabled
+if Config.STATS_ENDPOINT_ENABLED:
+    check_alive_blue_print.add_url_rule('/stats', view_func=process_stats, methods=['GET'])
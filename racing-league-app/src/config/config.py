@@ -15,10 +15,53 @@ class Config:
     ORIGINS = os.getenv('ORIGINS').split(',')
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'racing_league')
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+    # Comma-separated wire compressors, e.g. "zstd,snappy,zlib"; zstd and snappy need their extra packages
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', '')
     SENDER_EMAIL = os.getenv('SENDER_EMAIL')
     SENDER_NAME = os.getenv('SENDER_NAME')
     MAILER_SENDER_API_KEY = os.getenv('MAILER_SENDER_API_KEY')
     EMAIL_TEMPLATE_ID = os.getenv('EMAIL_TEMPLATE_ID')
+    EMAIL_TRANSPORT = os.getenv('EMAIL_TRANSPORT', 'mailersend')
+    EMAIL_WORKER_ENABLED = os.getenv('EMAIL_WORKER_ENABLED', 'false').lower() == 'true'
+    EMAIL_WORKER_INTERVAL = int(os.getenv('EMAIL_WORKER_INTERVAL', '5'))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+    EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv('EMAIL_OUTBOX_BACKOFF_SECONDS', '30'))
+    # Seconds between refreshes of leagues whose stored next race has passed; 0 disables them
+    NEXT_RACE_REFRESH_INTERVAL = int(os.getenv('NEXT_RACE_REFRESH_INTERVAL', '300'))
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', '120'))
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '60'))
+    LEAGUE_PAGE_DEFAULT_SIZE = int(os.getenv('LEAGUE_PAGE_DEFAULT_SIZE', '20'))
+    LEAGUE_PAGE_MAX_SIZE = int(os.getenv('LEAGUE_PAGE_MAX_SIZE', '100'))
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))
+    FIREBASE_USER_CACHE_SIZE = int(os.getenv('FIREBASE_USER_CACHE_SIZE', '1000'))
+    FIREBASE_USER_CACHE_TTL = int(os.getenv('FIREBASE_USER_CACHE_TTL', '300'))
+    FIREBASE_HTTP_POOL_SIZE = int(os.getenv('FIREBASE_HTTP_POOL_SIZE', '10'))
+    FIREBASE_HTTP_CONNECT_TIMEOUT = float(os.getenv('FIREBASE_HTTP_CONNECT_TIMEOUT', '3'))
+    FIREBASE_HTTP_READ_TIMEOUT = float(os.getenv('FIREBASE_HTTP_READ_TIMEOUT', '10'))
+    FIREBASE_HTTP_RETRIES = int(os.getenv('FIREBASE_HTTP_RETRIES', '2'))
+    FIREBASE_HTTP_BACKOFF = float(os.getenv('FIREBASE_HTTP_BACKOFF', '0.3'))
+    LOGIN_POOL_SIZE = int(os.getenv('LOGIN_POOL_SIZE', '8'))
+    ENSURE_INDEXES_ON_STARTUP = os.getenv('ENSURE_INDEXES_ON_STARTUP', 'false').lower() == 'true'
+    # Serve /api/v1/check/stats (process internals, signed-in users only)
+    STATS_ENDPOINT_ENABLED = os.getenv('STATS_ENDPOINT_ENABLED', 'false').lower() == 'true'
+    RESULT_IMAGE_MAX_BYTES = int(os.getenv('RESULT_IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+    RESULT_IMAGE_MAX_PIXELS = int(os.getenv('RESULT_IMAGE_MAX_PIXELS', '40000000'))
+    RESULT_IMAGE_MAX_DIMENSION = int(os.getenv('RESULT_IMAGE_MAX_DIMENSION', '2048'))
+    RESULT_IMAGE_QUALITY = int(os.getenv('RESULT_IMAGE_QUALITY', '85'))
+    RESULT_EXTRACTION_CLIENT = os.getenv('RESULT_EXTRACTION_CLIENT', 'openai')
+    RESULT_EXTRACTION_MODEL = os.getenv('RESULT_EXTRACTION_MODEL', 'gpt-4o')
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', '2'))
+    EXTRACTION_MAX_PENDING = int(os.getenv('EXTRACTION_MAX_PENDING', '10'))
+    EXTRACTION_IMAGE_CONCURRENCY = int(os.getenv('EXTRACTION_IMAGE_CONCURRENCY', '4'))
+    EXTRACTION_JOB_TTL = int(os.getenv('EXTRACTION_JOB_TTL', str(24 * 60 * 60)))
+    # Jobs queued or running longer than this are reported as failed, e.g. after a restart
+    EXTRACTION_JOB_TIMEOUT = int(os.getenv('EXTRACTION_JOB_TIMEOUT', str(10 * 60)))
 
     @staticmethod
     def init_firebase():
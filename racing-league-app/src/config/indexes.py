@@ -0,0 +1,183 @@
+import threading
+from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from src.config.config import Config
+from src.config.mongo import get_db
+
+# Enforces at most one pending invite per user and league; Invite.save_many relies
+# on it to reject duplicates, so it is also required at runtime (see require_index).
+# It cannot be built while duplicates exist; dedupe_pending_invites retires them.
+PENDING_INVITE_INDEX = IndexModel([("invited_user", ASCENDING), ("league", ASCENDING)], unique=True,
+                                  partialFilterExpression={"status": "pending"})
+
+# Every index the models rely on, per collection. Index names are left to
+# MongoDB's defaults (e.g. "owner_1") so indexes created by hand or by older
+# scripts are recognised instead of conflicting.
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)]),
+    ],
+    "leagues": [
+        IndexModel([("owner", ASCENDING)]),
+        # Old participant format (array of emails) and new format (array of objects)
+        IndexModel([("participants", ASCENDING)]),
+        IndexModel([("participants.email", ASCENDING)]),
+        # Listings filter on public/deleted_at and page on _id descending
+        IndexModel([("public", ASCENDING), ("deleted_at", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("next_race_at", ASCENDING)]),
+    ],
+    "invites": [
+        PENDING_INVITE_INDEX,
+        IndexModel([("invited_user", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("inviter", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("league", ASCENDING)]),
+    ],
+    "email_outbox": [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)]),
+        IndexModel([("lease_id", ASCENDING)]),
+    ],
+    "standings_snapshots": [
+        IndexModel([("league", ASCENDING), ("race_order", ASCENDING)], unique=True),
+    ],
+    "extraction_jobs": [
+        IndexModel([("league", ASCENDING)]),
+        # Finished jobs are only polled shortly after submission
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=Config.EXTRACTION_JOB_TTL),
+    ],
+}
+
+# Representative shapes of the queries the models issue, used to detect
+# queries that no registered index serves.
+QUERY_SHAPES = [
+    ("users", "User.get_user_by_mail", {"email": "driver@example.com"}, None),
+    ("users", "User.get_users_by_mails", {"email": {"$in": ["driver@example.com"]}}, None),
+    ("leagues", "League.get_leagues_by_owner", {"owner": "driver@example.com"}, None),
+    ("leagues", "League.get_leagues_by_participant", {"$or": [
+        {"participants": {"$in": ["driver@example.com"]}},
+        {"participants.email": "driver@example.com"}
+    ]}, None),
+    ("leagues", "League.get_all_leagues", {"deleted_at": None, "public": True}, [("_id", DESCENDING)]),
+    ("leagues", "League.get_public_leagues", {"deleted_at": None, "public": True}, [("_id", DESCENDING)]),
+    ("leagues", "League.racing_within_filter", {"next_race_at": {"$gte": datetime(2000, 1, 1), "$lt": datetime(2000, 1, 2)}}, [("next_race_at", ASCENDING)]),
+    ("invites", "Invite.get_active_invites_by_user", {"invited_user": "driver@example.com", "status": "pending"}, None),
+    ("invites", "Invite.get_sent_invites_by_user", {"inviter": "driver@example.com", "status": "pending"}, None),
+    ("invites", "Invite.get_invite_by_league_id", {"league": "000000000000000000000000"}, None),
+    ("standings_snapshots", "StandingsSnapshot.get_after_race", {"league": "000000000000000000000000", "race_order": {"$lte": 3}}, [("race_order", DESCENDING)]),
+    ("email_outbox", "EmailOutbox.claim_batch", {"status": "pending", "next_attempt_at": {"$lte": datetime(2000, 1, 1)}}, [("next_attempt_at", ASCENDING)]),
+]
+
+
+def dedupe_pending_invites(db=None):
+    """
+    Retire duplicate pending invites so PENDING_INVITE_INDEX can be built
+
+    The oldest pending invite of each user and league is kept; the others are
+    marked "duplicate" and soft-deleted.
+
+    Returns:
+        Number of invites retired
+    """
+    db = db if db is not None else get_db()
+    groups = db.invites.aggregate([
+        {"$match": {"status": "pending"}},
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {"_id": {"invited_user": "$invited_user", "league": "$league"},
+                    "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ])
+    duplicate_ids = [invite_id for group in groups for invite_id in group["ids"][1:]]
+    if not duplicate_ids:
+        return 0
+    result = db.invites.update_many(
+        {"_id": {"$in": duplicate_ids}, "status": "pending"},
+        {"$set": {"status": "duplicate", "deleted_at": datetime.now(timezone.utc)}}
+    )
+    return result.modified_count
+
+
+def ensure_indexes(db=None):
+    """
+    Create every registered index; existing indexes are left untouched
+
+    Indexes are created one by one, so an index that cannot be built (e.g. a
+    unique index over existing duplicates) does not block the others.
+
+    Returns:
+        Dict mapping collection names to {"created": [index names], "errors": [messages]}
+    """
+    db = db if db is not None else get_db()
+    report = {}
+    for collection, indexes in INDEXES.items():
+        result = report[collection] = {"created": [], "errors": []}
+        for index in indexes:
+            try:
+                result["created"].extend(db[collection].create_indexes([index]))
+            except OperationFailure as e:
+                result["errors"].append(str(e))
+    return report
+
+
+# (collection, index name) -> whether the index exists, checked once per process
+_required = {}
+_required_lock = threading.Lock()
+
+
+def require_index(collection, index, db=None):
+    """
+    Make sure an index the code depends on for correctness exists
+
+    The index is created on first use in each process (a no-op when it already
+    exists), so correctness does not depend on scripts/ensure_indexes.py having run.
+    An index that cannot be built, e.g. over existing duplicates, is reported once
+    and not retried, so callers can fall back instead of failing every write.
+
+    Returns:
+        True if the index exists, False if it could not be created
+    """
+    name = index.document["name"]
+    with _required_lock:
+        if (collection, name) in _required:
+            return _required[(collection, name)]
+        db = db if db is not None else get_db()
+        try:
+            options = dict(index.document)
+            keys = list(options.pop("key").items())
+            db[collection].create_index(keys, **options)
+            _required[(collection, name)] = True
+        except OperationFailure as e:
+            print(f"Required index {collection}.{name} is missing and could not be created "
+                  f"(run scripts/ensure_indexes.py): {e}")
+            _required[(collection, name)] = False
+        return _required[(collection, name)]
+
+
+def _has_collection_scan(plan):
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = list(plan.get("inputStages", []))
+    # Newer servers nest the classic plan under "queryPlan"
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            children.append(plan[key])
+    return any(_has_collection_scan(child) for child in children)
+
+
+def find_collection_scans(db=None):
+    """
+    Explain every registered query shape and list those planned as a collection scan
+
+    Returns:
+        List of (collection, query name) tuples whose winning plan contains a COLLSCAN
+    """
+    db = db if db is not None else get_db()
+    scans = []
+    for collection, name, query, sort in QUERY_SHAPES:
+        command = {"find": collection, "filter": query}
+        if sort:
+            command["sort"] = dict(sort)
+        explain = db.command("explain", command, verbosity="queryPlanner")
+        if _has_collection_scan(explain["queryPlanner"]["winningPlan"]):
+            scans.append((collection, name))
+    return scans
@@ -1,12 +1,150 @@
-from pymongo import MongoClient
+import os
+import threading
+import time
+from pymongo import MongoClient, monitoring
 from src.config.config import Config
 
-# Get MongoDB URI from environment variables
 
-# Connect to MongoDB
-client = MongoClient(Config.MONGO_URI)
-db = client[Config.MONGO_DB_NAME]
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener recording checkout waits and connection usage.
+
+    A checkout is timed from ConnectionCheckOutStarted to ConnectionCheckedOut
+    (or ConnectionCheckOutFailed) on the requesting thread, so a high wait with
+    a fast server points at pool starvation rather than at MongoDB.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._checkouts = 0
+        self._failures = {}
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._in_use = 0
+        self._max_in_use = 0
+        self._open = 0
+        self._clears = 0
+
+    def _wait_ms(self):
+        start = getattr(self._local, 'checkout_started', None)
+        self._local.checkout_started = None
+        return (time.perf_counter() - start) * 1000 if start is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            self._in_use += 1
+            self._max_in_use = max(self._max_in_use, self._in_use)
+
+    def connection_check_out_failed(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            # e.g. "timeout" when waitQueueTimeoutMS expired with every connection in use
+            self._failures[event.reason] = self._failures.get(event.reason, 0) + 1
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._open = max(0, self._open - 1)
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._clears += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "checkouts": self._checkouts,
+                "checkout_failures": dict(self._failures),
+                "avg_wait_ms": round(self._total_wait_ms / self._checkouts, 2) if self._checkouts else None,
+                "max_wait_ms": round(self._max_wait_ms, 2),
+                "in_use": self._in_use,
+                "max_in_use": self._max_in_use,
+                "open": self._open,
+                "max_pool_size": Config.MONGO_MAX_POOL_SIZE,
+                "pool_clears": self._clears
+            }
+
+
+def client_options():
+    """Pool, timeout and compression settings of the MongoClient"""
+    options = {
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    }
+    if Config.MONGO_COMPRESSORS:
+        options["compressors"] = Config.MONGO_COMPRESSORS
+    return options
+
+
+pool_metrics = PoolMetrics()
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Get the process-wide MongoClient, creating it on first use
+
+    A MongoClient must not be shared across fork(), so the client is created
+    lazily in each worker and recreated when the pid changes.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = MongoClient(Config.MONGO_URI, event_listeners=[pool_metrics], **client_options())
+            _client_pid = os.getpid()
+        return _client
+
 
-# Example function to get the database object if needed elsewhere
 def get_db():
-    return db
+    return get_client()[Config.MONGO_DB_NAME]
+
+
+def pool_stats():
+    return pool_metrics.stats()
+
+
+class LazyDatabase:
+    """Stand-in for the Database that resolves it through get_db on every access"""
+
+    def __getattr__(self, name):
+        return getattr(get_db(), name)
+
+    def __getitem__(self, name):
+        return get_db()[name]
+
+
+# Models keep using `from src.config.mongo import db`; nothing connects at import time
+db = LazyDatabase()
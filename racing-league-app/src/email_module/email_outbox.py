@@ -0,0 +1,108 @@
+from datetime import datetime, timezone, timedelta
+from bson.objectid import ObjectId
+from src.config.mongo import db
+from src.config.config import Config
+
+
+class EmailOutbox:
+    """
+    Durable queue of outgoing emails stored in the email_outbox collection.
+
+    Requests only insert messages; the EmailWorker claims them in batches and
+    hands them to the email transport. Message lifecycle:
+    pending -> sending -> sent, or back to pending with a backoff on failure,
+    and dead once max attempts are exhausted or when the message is invalid.
+    "sent" means the transport accepted the message; MailerSend's bulk API
+    delivers asynchronously.
+    """
+
+    @staticmethod
+    def build_message(to_email, to_name, subject, template_id=None, variables=None, text=None, html=None):
+        now = datetime.now(timezone.utc)
+        return {
+            "to": {"email": to_email, "name": to_name},
+            "subject": subject,
+            "template_id": template_id,
+            "variables": variables,
+            "text": text,
+            "html": html,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "locked_until": None,
+            "lease_id": None,
+            "last_error": None,
+            "created_at": now,
+            "sent_at": None
+        }
+
+    @staticmethod
+    def enqueue(to_email, to_name, subject, template_id=None, variables=None, text=None, html=None):
+        """Queue a single email and return its outbox id"""
+        message = EmailOutbox.build_message(to_email, to_name, subject, template_id, variables, text, html)
+        return db.email_outbox.insert_one(message).inserted_id
+
+    @staticmethod
+    def enqueue_many(messages):
+        """Queue several messages built with build_message in one insert"""
+        if not messages:
+            return []
+        return db.email_outbox.insert_many(messages).inserted_ids
+
+    @staticmethod
+    def claim_batch(limit, lease_seconds=None):
+        """
+        Atomically claim up to limit due messages for delivery
+
+        The batch is claimed in three round trips whatever its size: the due ids
+        are read, update_many stamps a fresh lease id on those still due (so two
+        workers never claim the same message), and the claimed messages are read
+        back by lease id. Messages stuck in "sending" past their lease (e.g. a
+        worker died mid-batch) are claimed again.
+        """
+        lease_seconds = lease_seconds or Config.EMAIL_OUTBOX_LEASE_SECONDS
+        now = datetime.now(timezone.utc)
+        due = {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "sending", "locked_until": {"$lt": now}}
+        ]}
+        ids = [message["_id"] for message in
+               db.email_outbox.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(limit)]
+        if not ids:
+            return []
+
+        lease_id = ObjectId()
+        db.email_outbox.update_many(
+            {"$and": [{"_id": {"$in": ids}}, due]},
+            {"$set": {"status": "sending", "locked_until": now + timedelta(seconds=lease_seconds), "lease_id": lease_id}}
+        )
+        return list(db.email_outbox.find({"lease_id": lease_id}).sort("next_attempt_at", 1))
+
+    @staticmethod
+    def mark_sent(message_ids):
+        db.email_outbox.update_many(
+            {"_id": {"$in": list(message_ids)}},
+            {"$set": {"status": "sent", "sent_at": datetime.now(timezone.utc), "locked_until": None}}
+        )
+
+    @staticmethod
+    def mark_dead(message, error):
+        """Dead-letter a message that can never be sent, e.g. a malformed address"""
+        db.email_outbox.update_one(
+            {"_id": message["_id"]},
+            {"$set": {"status": "dead", "attempts": message.get("attempts", 0) + 1,
+                      "last_error": str(error), "locked_until": None}}
+        )
+
+    @staticmethod
+    def mark_failed(message, error):
+        """Schedule a retry with exponential backoff, or dead-letter the message"""
+        attempts = message.get("attempts", 0) + 1
+        update = {"attempts": attempts, "last_error": str(error), "locked_until": None}
+        if attempts >= Config.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            update["status"] = "dead"
+        else:
+            delay = Config.EMAIL_OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1))
+            update["status"] = "pending"
+            update["next_attempt_at"] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        db.email_outbox.update_one({"_id": message["_id"]}, {"$set": update})
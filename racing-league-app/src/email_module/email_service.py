@@ -1,29 +1,26 @@
-from mailersend import MailerSendClient, EmailRequest, EmailContact
+from mailersend import EmailContact
 from src.config.config import Config
 from src.auth_module.auth_service import AuthService
-
-email_client = MailerSendClient(api_key=Config.MAILER_SENDER_API_KEY)
+from src.email_module.email_outbox import EmailOutbox
 
 class EmailService:
     
     @staticmethod
     def send_email(to_email: EmailContact, subject: str, text: str|None = None, html: str|None = None, template_id: str|None = None, variables: dict|None = None):
-        sender = EmailContact(email=Config.SENDER_EMAIL, name=Config.SENDER_NAME)
-        email_request = EmailRequest(
-            from_email=sender,
-            to=[to_email],
-            subject=subject,
-            text=text,
-            html=html,
-            template_id=template_id,
-            personalization=[{"email": to_email.email, "data": variables}] if variables else None
-        )
+        """Queue an email in the outbox; the EmailWorker delivers it in the background"""
         try:
-            response = email_client.emails.send(email_request)
-            print(f"Email sent successfully: {response}")
-            return response
+            message_id = EmailOutbox.enqueue(
+                to_email=to_email.email,
+                to_name=to_email.name,
+                subject=subject,
+                template_id=template_id,
+                variables=variables,
+                text=text,
+                html=html
+            )
+            return message_id
         except Exception as e:
-            print(f"Failed to send email: {str(e)}")
+            print(f"Failed to queue email: {str(e)}")
 
     @staticmethod
     def send_verification_email(to_email: str, name: str):
@@ -85,4 +82,33 @@ class EmailService:
             subject=subject,
             template_id=template_id,
             variables=variables
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def send_custom_emails(recipients: list, subject: str, message_top: str, message_bottom: str, button_name: str, url: str):
+        """
+        Queue the same templated email for several recipients with one outbox insert
+
+        Args:
+            recipients: List of (email, name) tuples
+        """
+        messages = []
+        for to_email, name in recipients:
+            variables = {
+                "name": name,
+                "url": url,
+                "message_top": message_top,
+                "message_bottom": message_bottom,
+                "button_name": button_name
+            }
+            messages.append(EmailOutbox.build_message(
+                to_email=to_email,
+                to_name=name,
+                subject=subject,
+                template_id=Config.EMAIL_TEMPLATE_ID,
+                variables=variables
+            ))
+        try:
+            return EmailOutbox.enqueue_many(messages)
+        except Exception as e:
+            print(f"Failed to queue emails: {str(e)}")
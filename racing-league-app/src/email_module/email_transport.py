@@ -0,0 +1,75 @@
+import re
+from mailersend import MailerSendClient, EmailRequest, EmailContact
+from src.config.config import Config
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def validate_message(message):
+    """
+    Check an outbox message can be sent at all, independently of the rest of its batch
+
+    Raises:
+        ValueError: If the recipient address is malformed or the message has no content
+    """
+    email = (message.get("to") or {}).get("email")
+    if not isinstance(email, str) or not EMAIL_PATTERN.match(email):
+        raise ValueError(f"Invalid recipient email: {email!r}")
+    if not (message.get("template_id") or message.get("text") or message.get("html")):
+        raise ValueError("Message has no template or body")
+
+
+class MailerSendTransport:
+    """
+    Delivers outbox messages through the MailerSend bulk endpoint
+
+    The bulk endpoint is asynchronous: a successful send_batch means MailerSend
+    accepted the batch, not that every email was delivered. Outbox messages are
+    marked "sent" on acceptance.
+    """
+
+    def __init__(self, api_key):
+        self.client = MailerSendClient(api_key=api_key)
+
+    def prepare(self, message):
+        """Build the EmailRequest for one message; raises if the message is invalid"""
+        validate_message(message)
+        to = message["to"]
+        variables = message.get("variables")
+        return EmailRequest(
+            from_email=EmailContact(email=Config.SENDER_EMAIL, name=Config.SENDER_NAME),
+            to=[EmailContact(email=to["email"], name=to.get("name"))],
+            subject=message["subject"],
+            text=message.get("text"),
+            html=message.get("html"),
+            template_id=message.get("template_id"),
+            personalization=[{"email": to["email"], "data": variables}] if variables else None
+        )
+
+    def send_batch(self, prepared):
+        """Send requests built by prepare in one bulk call"""
+        return self.client.emails.send_bulk(prepared)
+
+
+class LocalTransport:
+    """Records messages in memory instead of sending them; for development and tests"""
+
+    def __init__(self):
+        self.sent = []
+
+    def prepare(self, message):
+        validate_message(message)
+        return message
+
+    def send_batch(self, prepared):
+        for message in prepared:
+            print(f"[local email] to={message['to']['email']} subject={message['subject']}")
+        self.sent.extend(prepared)
+        return {"accepted": len(prepared)}
+
+
+def get_email_transport():
+    """Transport selected by EMAIL_TRANSPORT ("mailersend" or "local")"""
+    if Config.EMAIL_TRANSPORT == 'local':
+        return LocalTransport()
+    return MailerSendTransport(api_key=Config.MAILER_SENDER_API_KEY)
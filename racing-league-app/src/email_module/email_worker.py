@@ -0,0 +1,74 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+from src.config.config import Config
+from src.email_module.email_outbox import EmailOutbox
+from src.email_module.email_transport import get_email_transport
+
+
+class EmailWorker:
+    """Drains the email outbox in batches through an email transport"""
+
+    def __init__(self, transport=None, batch_size=None):
+        self.transport = transport or get_email_transport()
+        self.batch_size = batch_size or Config.EMAIL_OUTBOX_BATCH_SIZE
+
+    def run_once(self):
+        """
+        Deliver one batch of due messages
+
+        Returns:
+            Number of messages accepted by the transport
+        """
+        return self._run_batch()[1]
+
+    def _run_batch(self):
+        messages = EmailOutbox.claim_batch(self.batch_size)
+        if not messages:
+            return 0, 0
+
+        # Each message is built on its own so an invalid one cannot fail the batch;
+        # it will never become valid, so it is dead-lettered right away
+        valid = []
+        prepared = []
+        for message in messages:
+            try:
+                prepared.append(self.transport.prepare(message))
+                valid.append(message)
+            except Exception as e:
+                print(f"Rejected email {message['_id']}: {str(e)}")
+                EmailOutbox.mark_dead(message, e)
+        if not valid:
+            return len(messages), 0
+
+        try:
+            self.transport.send_batch(prepared)
+        except Exception as e:
+            print(f"Failed to send email batch: {str(e)}")
+            for message in valid:
+                EmailOutbox.mark_failed(message, e)
+            return len(messages), 0
+        EmailOutbox.mark_sent(message["_id"] for message in valid)
+        return len(messages), len(valid)
+
+    def drain(self):
+        """Deliver batches until no due message is left"""
+        total = 0
+        while True:
+            claimed, sent = self._run_batch()
+            total += sent
+            if claimed < self.batch_size:
+                return total
+
+
+scheduler = BackgroundScheduler()
+
+
+def start_email_worker():
+    """Drain the outbox every EMAIL_WORKER_INTERVAL seconds in a background thread"""
+    worker = EmailWorker()
+    scheduler.add_job(func=worker.drain, trigger="interval", seconds=Config.EMAIL_WORKER_INTERVAL,
+                      max_instances=1, coalesce=True)
+    scheduler.start()
+
+
+import atexit
+atexit.register(lambda: scheduler.shutdown() if scheduler.running else None)
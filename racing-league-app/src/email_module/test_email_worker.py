@@ -0,0 +1,88 @@
+from datetime import datetime, timezone, timedelta
+from src.config.config import Config
+from src.email_module.email_outbox import EmailOutbox
+from src.email_module.email_transport import LocalTransport
+from src.email_module.email_worker import EmailWorker
+
+
+def enqueue(email, subject="Hello", template_id="template"):
+    return EmailOutbox.enqueue(email, "Name", subject, template_id=template_id)
+
+
+def test_poison_message_is_dead_lettered_and_the_rest_is_sent(mongo_db):
+    good_ids = [enqueue("one@example.com"), enqueue("two@example.com")]
+    bad_address = enqueue("not an email")
+    no_content = enqueue("three@example.com", template_id=None)
+    transport = LocalTransport()
+
+    sent = EmailWorker(transport=transport, batch_size=10).run_once()
+
+    assert sent == 2
+    assert [message["_id"] for message in transport.sent] == good_ids
+    statuses = {message["_id"]: message["status"] for message in mongo_db.email_outbox.find()}
+    assert [statuses[_id] for _id in good_ids] == ["sent", "sent"]
+    assert statuses[bad_address] == "dead"
+    assert statuses[no_content] == "dead"
+    assert "Invalid recipient" in mongo_db.email_outbox.find_one({"_id": bad_address})["last_error"]
+
+
+def test_drain_keeps_going_past_a_batch_of_rejected_messages(mongo_db):
+    enqueue("bad")
+    enqueue("worse")
+    good = enqueue("good@example.com")
+    transport = LocalTransport()
+
+    assert EmailWorker(transport=transport, batch_size=2).drain() == 1
+    assert [message["_id"] for message in transport.sent] == [good]
+
+
+class FailingTransport(LocalTransport):
+    def send_batch(self, prepared):
+        raise RuntimeError("API down")
+
+
+def test_transport_failure_backs_off_then_dead_letters(mongo_db, monkeypatch):
+    monkeypatch.setattr(Config, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    message_id = enqueue("one@example.com")
+    worker = EmailWorker(transport=FailingTransport(), batch_size=10)
+
+    before = datetime.now(timezone.utc)
+    assert worker.run_once() == 0
+    message = mongo_db.email_outbox.find_one({"_id": message_id})
+    assert message["status"] == "pending"
+    assert message["attempts"] == 1
+    retry_at = message["next_attempt_at"].replace(tzinfo=timezone.utc)
+    assert retry_at >= before + timedelta(seconds=Config.EMAIL_OUTBOX_BACKOFF_SECONDS - 1)
+
+    # Not due yet: nothing is claimed
+    assert EmailOutbox.claim_batch(10) == []
+
+    mongo_db.email_outbox.update_one({"_id": message_id}, {"$set": {"next_attempt_at": before}})
+    assert worker.run_once() == 0
+    message = mongo_db.email_outbox.find_one({"_id": message_id})
+    assert message["status"] == "dead"
+    assert message["attempts"] == 2
+    assert message["last_error"] == "API down"
+
+
+def test_claim_batch_claims_each_due_message_once(mongo_db):
+    ids = [enqueue(f"driver{i}@example.com") for i in range(5)]
+
+    first = EmailOutbox.claim_batch(3)
+    second = EmailOutbox.claim_batch(3)
+
+    assert [message["_id"] for message in first] == ids[:3]
+    assert [message["_id"] for message in second] == ids[3:]
+    assert all(message["status"] == "sending" for message in first + second)
+    assert EmailOutbox.claim_batch(3) == []
+
+
+def test_expired_lease_is_claimed_again(mongo_db):
+    message_id = enqueue("one@example.com")
+    EmailOutbox.claim_batch(1)
+    mongo_db.email_outbox.update_one(
+        {"_id": message_id},
+        {"$set": {"locked_until": datetime.now(timezone.utc) - timedelta(seconds=1)}}
+    )
+
+    assert [message["_id"] for message in EmailOutbox.claim_batch(1)] == [message_id]
@@ -0,0 +1,120 @@
+import json
+import re
+from src.config.config import Config
+from src.league_module.image_preprocessing import to_data_url
+
+SYSTEM_PROMPT = "You are an AI assistant that extracts structured data from images."
+
+# Prompt to extract structured results
+PROMPT = """
+Analyze the image(s) and extract any race result tables or listings.
+
+Return the data in JSON format like this:
+[
+  {
+    "position": 1,
+    "driver": "Name",
+    "team": "Team Name",
+    "time": "1:23.456"
+  },
+  ...
+]
+If information is missing, fill only what is available.
+"""
+
+
+def parse_results(content):
+    """
+    Parse the model's answer into a list of result rows
+
+    Returns:
+        The parsed JSON, or a dict with an "error" key if it is not valid JSON
+    """
+    # Remove ```json and ``` markers
+    json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
+    if json_match:
+        json_string = json_match.group(1)
+    else:
+        # If no markdown blocks, assume the entire content is JSON
+        json_string = content
+
+    try:
+        return json.loads(json_string)
+    except json.JSONDecodeError as e:
+        return {
+            "error": "Failed to parse JSON",
+            "raw_content": content,
+            "json_error": str(e)
+        }
+
+
+class OpenAIVisionClient:
+    """Extracts results from a screenshot with an OpenAI vision model"""
+
+    def __init__(self, api_key=None, model=None):
+        try:
+            from openai import OpenAI
+        except ImportError as e:
+            raise ImportError(f"OpenAI package not installed: {e}")
+        api_key = api_key or Config.OPENAI_API_KEY
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        self.client = OpenAI(api_key=api_key)
+        self.model = model or Config.RESULT_EXTRACTION_MODEL
+
+    def extract(self, *encoded_images):
+        """
+        Extract one result list from all the given screenshots in a single request
+
+        Args:
+            encoded_images: Base64 JPEGs produced by image_preprocessing.preprocess_image
+
+        Returns:
+            Parsed result rows, see parse_results
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": PROMPT},
+                        *[{"type": "image_url", "image_url": {"url": to_data_url(encoded_image)}}
+                          for encoded_image in encoded_images]
+                    ]
+                }
+            ]
+        )
+        return parse_results(response.choices[0].message.content)
+
+
+class StubVisionClient:
+    """Returns fixed results without calling any API; for development and tests"""
+
+    def __init__(self, results=None):
+        self.results = results if results is not None else [
+            {"position": 1, "driver": "Driver One", "team": "Team One", "time": "1:23.456"}
+        ]
+        self.calls = 0
+
+    def extract(self, *encoded_images):
+        self.calls += 1
+        return [dict(row) for row in self.results]
+
+
+client = None
+
+
+def get_extraction_client():
+    """Client selected by RESULT_EXTRACTION_CLIENT ("openai" or "stub"), created once per process"""
+    global client
+    if client is None:
+        if Config.RESULT_EXTRACTION_CLIENT == 'stub':
+            client = StubVisionClient()
+        else:
+            try:
+                client = OpenAIVisionClient()
+            except Exception as e:
+                raise Exception(f"Failed to initialize OpenAI client: {e}")
+    return client
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from bson.objectid import ObjectId
+from src.config.config import Config
+from src.config.mongo import db
+
+TIMEOUT_ERROR = "Extraction job timed out"
+
+
+class ExtractionJob:
+    """
+    Result extraction jobs stored in the extraction_jobs collection.
+
+    Job lifecycle: queued -> running -> done or failed. The screenshots
+    themselves are never stored, only the extracted results. Jobs run in the
+    process that accepted them, so a restart leaves them queued or running
+    forever; once EXTRACTION_JOB_TIMEOUT has passed they count as failed.
+    """
+
+    @staticmethod
+    def create(league_id, race_id, requested_by, image_count):
+        """Insert a queued job and return its id"""
+        return db.extraction_jobs.insert_one({
+            "league": str(league_id),
+            "race_id": race_id,
+            "requested_by": requested_by,
+            "image_count": image_count,
+            "status": "queued",
+            "results": None,
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+            "started_at": None,
+            "finished_at": None
+        }).inserted_id
+
+    @staticmethod
+    def mark_running(job_id):
+        db.extraction_jobs.update_one(
+            {"_id": job_id, "status": "queued"},
+            {"$set": {"status": "running", "started_at": datetime.now(timezone.utc)}}
+        )
+
+    @staticmethod
+    def mark_done(job_id, results):
+        # A job that already timed out stays failed
+        db.extraction_jobs.update_one(
+            {"_id": job_id, "status": {"$in": ["queued", "running"]}},
+            {"$set": {"status": "done", "results": results, "finished_at": datetime.now(timezone.utc)}}
+        )
+
+    @staticmethod
+    def mark_failed(job_id, error, details=None):
+        """Record a failure; details (e.g. the model's unparsable answer) are kept in results"""
+        db.extraction_jobs.update_one(
+            {"_id": job_id, "status": {"$in": ["queued", "running"]}},
+            {"$set": {"status": "failed", "error": str(error), "results": details,
+                      "finished_at": datetime.now(timezone.utc)}}
+        )
+
+    @staticmethod
+    def stale_filter(now=None):
+        """Filter matching jobs queued or running for longer than EXTRACTION_JOB_TIMEOUT"""
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=Config.EXTRACTION_JOB_TIMEOUT)
+        return {"$or": [
+            {"status": "queued", "created_at": {"$lt": cutoff}},
+            {"status": "running", "started_at": {"$lt": cutoff}}
+        ]}
+
+    @staticmethod
+    def fail_stale_jobs():
+        """
+        Mark every timed out job as failed
+
+        Returns:
+            Number of jobs marked failed
+        """
+        now = datetime.now(timezone.utc)
+        return db.extraction_jobs.update_many(
+            ExtractionJob.stale_filter(now),
+            {"$set": {"status": "failed", "error": TIMEOUT_ERROR, "finished_at": now}}
+        ).modified_count
+
+    @staticmethod
+    def is_stale(job, now=None):
+        """Whether a loaded job has been queued or running for longer than EXTRACTION_JOB_TIMEOUT"""
+        since = {"queued": job.get("created_at"), "running": job.get("started_at")}.get(job.get("status"))
+        if since is None:
+            return False
+        if not since.tzinfo:
+            # MongoDB hands back naive datetimes that are in UTC
+            since = since.replace(tzinfo=timezone.utc)
+        now = now or datetime.now(timezone.utc)
+        return now - since > timedelta(seconds=Config.EXTRACTION_JOB_TIMEOUT)
+
+    @staticmethod
+    def get_job(league_id, job_id):
+        """Load a job of the given league, or None; timed out jobs are reported as failed"""
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = db.extraction_jobs.find_one({"_id": ObjectId(job_id), "league": str(league_id)})
+        if job and ExtractionJob.is_stale(job):
+            job = {**job, "status": "failed", "error": TIMEOUT_ERROR}
+        return job
+
+    @staticmethod
+    def serialize(job):
+        return {
+            "_id": str(job["_id"]),
+            "league": job["league"],
+            "race_id": job["race_id"],
+            "status": job["status"],
+            "image_count": job.get("image_count"),
+            "results": job.get("results"),
+            "error": job.get("error"),
+            "created_at": job.get("created_at"),
+            "started_at": job.get("started_at"),
+            "finished_at": job.get("finished_at")
+        }
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config.config import Config
+from src.extraction_module.extraction_client import get_extraction_client
+from src.extraction_module.extraction_job import ExtractionJob
+
+# Runs queued jobs; the semaphore bounds queued + running jobs so a burst of
+# uploads is rejected instead of piling up screenshots in memory.
+job_executor = ThreadPoolExecutor(max_workers=Config.EXTRACTION_WORKERS, thread_name_prefix="extraction-job")
+job_slots = threading.BoundedSemaphore(Config.EXTRACTION_MAX_PENDING)
+
+# Model requests for the images of a job; separate from job_executor so a job
+# never waits on a slot held by another job.
+image_executor = ThreadPoolExecutor(max_workers=Config.EXTRACTION_IMAGE_CONCURRENCY, thread_name_prefix="extraction-image")
+
+
+def merge_results(results_per_image):
+    """
+    Merge the rows extracted from each screenshot into one result list
+
+    Screenshots of one race may overlap, so a row is dropped when an earlier
+    image already had the same driver at the same position. Rows that give one
+    position to different drivers are all kept, so a misread is left for the
+    admin to correct instead of silently losing a driver.
+
+    Returns:
+        The merged rows sorted by position, or the first parse error
+    """
+    merged = []
+    seen = set()
+    for results in results_per_image:
+        if isinstance(results, dict):
+            return results
+        for row in results:
+            position = row.get("position") if isinstance(row, dict) else None
+            if position is not None:
+                key = (position, row.get("driver"))
+                if key in seen:
+                    continue
+                seen.add(key)
+            merged.append(row)
+
+    if all(isinstance(row, dict) and isinstance(row.get("position"), int) for row in merged):
+        merged.sort(key=lambda row: row["position"])
+    return merged
+
+
+class ExtractionService:
+
+    @staticmethod
+    def extract_results(encoded_images, client=None, concurrent=False):
+        """
+        Extract results from screenshots
+
+        By default every image goes into one model request, which reads them as
+        one result table. Jobs pass concurrent=True to send one request per
+        image at the same time and merge the rows, see merge_results.
+
+        Args:
+            encoded_images: Base64 JPEGs produced by image_preprocessing.preprocess_image
+            client: Extraction client, defaults to get_extraction_client()
+            concurrent: Whether to send one concurrent request per image
+        """
+        client = client or get_extraction_client()
+        if not concurrent or len(encoded_images) == 1:
+            return client.extract(*encoded_images)
+        futures = [image_executor.submit(client.extract, encoded_image) for encoded_image in encoded_images]
+        return merge_results([future.result() for future in futures])
+
+    @staticmethod
+    def submit_job(league_id, race_id, requested_by, encoded_images, client=None):
+        """
+        Queue an extraction job and return its id immediately
+
+        Raises an exception when EXTRACTION_MAX_PENDING jobs are already queued or running.
+        """
+        if not job_slots.acquire(blocking=False):
+            raise Exception("Too many extraction jobs in progress")
+        try:
+            # Jobs lost to a restart would otherwise stay queued or running
+            ExtractionJob.fail_stale_jobs()
+        except Exception as e:
+            print(f"Failed to sweep stale extraction jobs: {str(e)}")
+        try:
+            job_id = ExtractionJob.create(league_id, race_id, requested_by, len(encoded_images))
+            job_executor.submit(ExtractionService.run_job, job_id, encoded_images, client)
+        except Exception:
+            job_slots.release()
+            raise
+        return job_id
+
+    @staticmethod
+    def run_job(job_id, encoded_images, client=None):
+        try:
+            ExtractionJob.mark_running(job_id)
+            results = ExtractionService.extract_results(encoded_images, client, concurrent=True)
+            if isinstance(results, dict) and "error" in results:
+                ExtractionJob.mark_failed(job_id, results["error"], details=results)
+            else:
+                ExtractionJob.mark_done(job_id, results)
+        except Exception as e:
+            print(f"Extraction job {job_id} failed: {str(e)}")
+            ExtractionJob.mark_failed(job_id, e)
+        finally:
+            job_slots.release()
+
+    @staticmethod
+    def get_job(league_id, job_id):
+        job = ExtractionJob.get_job(league_id, job_id)
+        return ExtractionJob.serialize(job) if job else None
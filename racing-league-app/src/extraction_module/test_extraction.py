@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+from src.config.config import Config
+from src.extraction_module import extraction_service
+from src.extraction_module.extraction_client import StubVisionClient, parse_results
+from src.extraction_module.extraction_job import ExtractionJob
+from src.extraction_module.extraction_service import ExtractionService, merge_results
+
+
+def test_stub_client_returns_copies_of_its_results():
+    client = StubVisionClient([{"position": 1, "driver": "A"}])
+
+    first = client.extract("image")
+    first[0]["driver"] = "changed"
+
+    assert client.extract("image") == [{"position": 1, "driver": "A"}]
+    assert client.calls == 2
+
+
+def test_parse_results_reads_fenced_and_plain_json():
+    assert parse_results('Here you go:\n```json\n[{"position": 1}]\n```') == [{"position": 1}]
+    assert parse_results('[{"position": 2}]') == [{"position": 2}]
+
+
+def test_parse_results_reports_invalid_json():
+    parsed = parse_results("no table found")
+
+    assert parsed["error"] == "Failed to parse JSON"
+    assert parsed["raw_content"] == "no table found"
+
+
+def test_merge_results_drops_overlapping_rows_and_sorts():
+    merged = merge_results([
+        [{"position": 2, "driver": "B"}, {"position": 1, "driver": "A"}],
+        [{"position": 2, "driver": "B", "time": "+1.2"}, {"position": 3, "driver": "C"}],
+    ])
+
+    assert merged == [{"position": 1, "driver": "A"}, {"position": 2, "driver": "B"}, {"position": 3, "driver": "C"}]
+
+
+def test_merge_results_keeps_different_drivers_with_the_same_position():
+    merged = merge_results([
+        [{"position": 1, "driver": "A"}, {"position": 2, "driver": "B"}],
+        [{"position": 2, "driver": "C"}],
+    ])
+
+    assert merged == [{"position": 1, "driver": "A"}, {"position": 2, "driver": "B"}, {"position": 2, "driver": "C"}]
+
+
+def test_extraction_sends_one_request_for_all_images():
+    client = StubVisionClient()
+
+    results = ExtractionService.extract_results(["one", "two"], client)
+
+    assert client.calls == 1
+    assert results == client.results
+
+
+def test_merge_results_keeps_rows_without_position_in_order():
+    merged = merge_results([[{"driver": "A"}, {"position": "P2", "driver": "B"}], [{"driver": "C"}]])
+
+    assert merged == [{"driver": "A"}, {"position": "P2", "driver": "B"}, {"driver": "C"}]
+
+
+def test_merge_results_returns_the_first_parse_error():
+    error = {"error": "Failed to parse JSON"}
+
+    assert merge_results([[{"position": 1}], error, {"error": "other"}]) == error
+
+
+def test_run_job_stores_the_stub_results(mongo_db):
+    job_id = ExtractionJob.create("league", "race", "owner@example.com", 2)
+    # run_job releases the slot submit_job took
+    extraction_service.job_slots.acquire()
+
+    client = StubVisionClient()
+
+    ExtractionService.run_job(job_id, ["one", "two"], client)
+
+    # Jobs send one concurrent request per image
+    assert client.calls == 2
+    job = ExtractionService.get_job("league", str(job_id))
+    assert job["status"] == "done"
+    assert job["results"] == [{"position": 1, "driver": "Driver One", "team": "Team One", "time": "1:23.456"}]
+
+
+def test_timed_out_jobs_are_reported_and_swept_as_failed(mongo_db):
+    job_id = ExtractionJob.create("league", "race", "owner@example.com", 1)
+    ExtractionJob.mark_running(job_id)
+    started = datetime.now(timezone.utc) - timedelta(seconds=Config.EXTRACTION_JOB_TIMEOUT + 1)
+    mongo_db.extraction_jobs.update_one({"_id": job_id}, {"$set": {"started_at": started}})
+
+    job = ExtractionService.get_job("league", str(job_id))
+    assert (job["status"], job["error"]) == ("failed", "Extraction job timed out")
+
+    assert ExtractionJob.fail_stale_jobs() == 1
+    # A late result does not revive the job
+    ExtractionJob.mark_done(job_id, [])
+    assert mongo_db.extraction_jobs.find_one({"_id": job_id})["status"] == "failed"
+
+
+def test_recent_jobs_are_not_timed_out(mongo_db):
+    job_id = ExtractionJob.create("league", "race", "owner@example.com", 1)
+
+    assert ExtractionService.get_job("league", str(job_id))["status"] == "queued"
+    assert ExtractionJob.fail_stale_jobs() == 0
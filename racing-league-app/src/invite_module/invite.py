@@ -1,10 +1,13 @@
 from datetime import datetime, timezone
 
 from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from src.config.mongo import db
+from src.config.indexes import PENDING_INVITE_INDEX, require_index
 from src.league_module.league import League
-from src.user_module.user import User
+from src.league_module.league_summary import LeagueSummary
+from src.user_module.user_loader import UserLoader
 
 
 class Invite:
@@ -21,17 +24,17 @@ class Invite:
     def serialize(self):
         return {
             "_id": str(self._id) if self._id else None,
-            "league": self.league.serialize(),
+            "league": self.league.serialize() if self.league else None,
             "invited_user": self.invited_user,
-            "inviter": self.inviter.serialize(),
+            "inviter": self.inviter.serialize() if self.inviter else None,
             "status": self.status,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
             "deleted_at": self.deleted_at
         }
     
-    def save(self):
-        invite = {
+    def to_document(self):
+        return {
             "league": str(self.league._id),
             "invited_user": self.invited_user,
             "inviter": self.inviter.email,
@@ -40,9 +43,83 @@ class Invite:
             "updated_at": self.updated_at,
             "deleted_at": self.deleted_at
         }
-        result = db.invites.insert_one(invite)
+
+    def save(self):
+        if not require_index("invites", PENDING_INVITE_INDEX) and Invite._pending_pairs([self]):
+            raise Exception("Invite already sent")
+        try:
+            result = db.invites.insert_one(self.to_document())
+        except DuplicateKeyError:
+            raise Exception("Invite already sent")
         self._id = result.inserted_id
 
+    @staticmethod
+    def save_many(invites):
+        """
+        Insert several new invites with a single unordered insert_many
+
+        A unique index on (invited_user, league) for pending invites makes the
+        insert itself the duplicate check, so two concurrent requests cannot
+        both create the same invite.
+
+        Returns:
+            The invites rejected as duplicates; all others have their _id set
+        """
+        if not invites:
+            return []
+        duplicates = []
+        # Without the index duplicates would be accepted silently
+        if not require_index("invites", PENDING_INVITE_INDEX):
+            invites, duplicates = Invite._drop_pending(invites)
+            if not invites:
+                return duplicates
+        documents = [invite.to_document() for invite in invites]
+        duplicate_indexes = set()
+        try:
+            db.invites.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") != 11000:
+                    raise
+                duplicate_indexes.add(error["index"])
+
+        for index, (invite, document) in enumerate(zip(invites, documents)):
+            if index in duplicate_indexes:
+                duplicates.append(invite)
+            else:
+                # insert_many assigns the _id on the documents before sending them
+                invite._id = document["_id"]
+        return duplicates
+
+    @staticmethod
+    def _pending_pairs(invites):
+        """The (invited_user, league) pairs of the invites that already have a pending invite"""
+        documents = db.invites.find({
+            "status": "pending",
+            "$or": [{"invited_user": invite.invited_user, "league": str(invite.league._id)} for invite in invites]
+        }, {"invited_user": 1, "league": 1})
+        return {(document["invited_user"], document["league"]) for document in documents}
+
+    @staticmethod
+    def _drop_pending(invites):
+        """
+        Check for duplicates before inserting while PENDING_INVITE_INDEX is missing
+
+        Unlike the index, this does not stop two concurrent requests from both
+        creating the same invite; it only keeps invites working until
+        scripts/ensure_indexes.py has retired the existing duplicates.
+
+        Returns:
+            Tuple of (invites to insert, invites rejected as duplicates)
+        """
+        seen = Invite._pending_pairs(invites)
+        new, duplicates = [], []
+        for invite in invites:
+            pair = (invite.invited_user, str(invite.league._id))
+            (duplicates if pair in seen else new).append(invite)
+            seen.add(pair)
+        return new, duplicates
+
     def update(self):
         db.invites.update_one(
             {"_id": self._id},
@@ -69,35 +146,36 @@ class Invite:
         self.update()
 
     @staticmethod
-    def get_invites_by_user(email):
-        invites = db.invites.find({"invited_user": email})
+    def _from_documents(invites):
+        """
+        Build invites for a listing, batch-loading what they reference
 
-        invite_list = [Invite(
+        Leagues are loaded as compact LeagueSummary objects with one $in query
+        and inviters through the request's UserLoader, so the number of queries
+        does not grow with the number of invites or the size of each league.
+        """
+        invites = list(invites)
+        leagues = LeagueSummary.get_summaries_by_ids(invite["league"] for invite in invites)
+        inviters = UserLoader.current().load_many(invite["inviter"] for invite in invites)
+
+        return [Invite(
             _id=invite["_id"],
             invited_user=invite["invited_user"],
-            league=League.get_league_by_id(invite["league"]),
-            inviter=User.get_user_by_mail(invite["inviter"]),
+            league=leagues.get(str(invite["league"])),
+            inviter=inviters.get(invite["inviter"]),
             status=invite["status"],
             created_at=invite["created_at"],
             updated_at=invite["updated_at"],
             deleted_at=invite["deleted_at"]
         ) for invite in invites]
-        return invite_list
+
+    @staticmethod
+    def get_invites_by_user(email):
+        return Invite._from_documents(db.invites.find({"invited_user": email}))
     
+    @staticmethod
     def get_active_invites_by_user(email):
-        invites = db.invites.find({"invited_user": email, "status": "pending"})
-
-        invite_list = [Invite(
-            _id=invite["_id"],
-            invited_user=invite["invited_user"],
-            league=League.get_league_by_id(invite["league"]),
-            inviter=User.get_user_by_mail(invite["inviter"]),
-            status=invite["status"],
-            created_at=invite["created_at"],
-            updated_at=invite["updated_at"],
-            deleted_at=invite["deleted_at"]
-        ) for invite in invites]
-        return invite_list
+        return Invite._from_documents(db.invites.find({"invited_user": email, "status": "pending"}))
 
     @staticmethod
     def get_invite_by_id(invite_id):
@@ -106,7 +184,7 @@ class Invite:
             _id=invite["_id"],
             invited_user=invite["invited_user"],
             league=League.get_league_by_id(invite["league"]),
-            inviter=User.get_user_by_mail(invite["inviter"]),
+            inviter=UserLoader.current().load(invite["inviter"]),
             status=invite["status"],
             created_at=invite["created_at"],
             updated_at=invite["updated_at"],
@@ -119,14 +197,4 @@ class Invite:
 
     @staticmethod
     def get_sent_invites_by_user(email):
-        invites = db.invites.find({"inviter": email, "status": "pending"})
-        return [Invite(
-            _id=invite["_id"],
-            invited_user=invite["invited_user"],
-            league=invite["league"],
-            inviter=invite["inviter"],
-            status=invite["status"],
-            created_at= invite["created_at"],
-            updated_at= invite["updated_at"],
-            deleted_at= invite["deleted_at"]
-        )for invite in invites]
\ No newline at end of file
+        return Invite._from_documents(db.invites.find({"inviter": email, "status": "pending"}))
@@ -2,23 +2,20 @@ from flask import Blueprint, request, jsonify
 from src.auth_module.auth_service import login_required
 from src.invite_module.invite_service import InviteService
 from src.auth_module.auth_service import AuthService
-from firebase_admin import auth
 
 invite_blueprint = Blueprint('invite', __name__, url_prefix='/api/v1/invites')
 
 @invite_blueprint.route('/my', methods=['GET'])
 @login_required
 def get_my_invites():
-    uid = AuthService.get_current_user()
-    user = auth.get_user(uid)
+    user = AuthService.get_current_principal()
     invites = InviteService.get_invites_by_user(user.email)
     return jsonify([invite.serialize() for invite in invites]), 200
 
 @invite_blueprint.route('/sent', methods=['GET'])
 @login_required
 def get_sent_invites():
-    uid = AuthService.get_current_user()
-    user = auth.get_user(uid)
+    user = AuthService.get_current_principal()
     invites = InviteService.get_sent_invites_by_user(user.email)
     return jsonify([invite.serialize() for invite in invites])
 
@@ -30,8 +27,12 @@ def create_invite():
         data = request.json
         if not data.get('emails') or not data.get('league_id'):
             return jsonify({"message": "Missing required fields"}), 400
-        invites = InviteService.create_invites(data.get('emails'), data.get('league_id'))
-        return jsonify([invite.serialize() for invite in invites]), 201
+        invites, skipped = InviteService.create_invites(data.get('emails'), data.get('league_id'))
+        # skipped lists the emails that already had a pending invite to the league
+        return jsonify({
+            "invites": [invite.serialize() for invite in invites],
+            "skipped": skipped
+        }), 201
     except Exception as e:
         if str(e) == "User not found":
             return jsonify({"message": "User not found"}), 404
@@ -1,8 +1,7 @@
 from src.league_module.league_service import LeagueService
 from src.invite_module.invite import Invite
 from src.auth_module.auth_service import AuthService
-from firebase_admin import auth
-from src.user_module.user import User
+from src.user_module.user_loader import UserLoader
 from src.email_module.email_service import EmailService
 
 class InviteService:
@@ -13,45 +12,61 @@ class InviteService:
 
     @staticmethod
     def create_invite(email, league_id):
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
-        inviter = User.get_user_by_mail(user.email)
-        invitee = User.get_user_by_mail(email)
+        invites, _ = InviteService.create_invites([email], league_id)
+        return invites[0]
+
+    @staticmethod
+    def create_invites(email_list, league_id):
+        """
+        Invite several users to a league in one pass
+
+        The league and the inviter are loaded once, invitees are looked up with
+        one $in query, the invites are written with a single insert_many and the
+        emails are queued with one outbox insert. Emails that already have a
+        pending invite to the league are skipped; if all of them do, the
+        "Invite already sent" error is raised.
+
+        Returns:
+            Tuple of (created invites, skipped emails)
+        """
+        # Drop duplicate emails while keeping the submitted order
+        emails = list(dict.fromkeys(email_list))
+        user = AuthService.get_current_principal()
+        users = UserLoader.current().load_many(emails + [user.email])
+        inviter = users.get(user.email)
 
         if not inviter:
             raise Exception("User not found")
-        if not LeagueService.get_league_by_id(league_id):
+        league = LeagueService.get_league_by_id(league_id)
+        if not league:
             raise Exception("League not found")
-        invites = Invite.get_invites_by_user(email)
-        if len(invites) > 0:
-            for invite in invites:
-                if invite.invited_user == email and str(invite.league._id) == league_id:
-                    raise Exception("Invite already sent")
 
-        invite = Invite(
-            league=LeagueService.get_league_by_id(league_id),
-            inviter=inviter,
-            invited_user=email,
-            status="pending"
-        )
-        invite.save()
-        EmailService.send_custom_email(
-            to_email=email,
-            name=invitee.name if invitee else email,
+        invites = [
+            Invite(
+                league=league,
+                inviter=inviter,
+                invited_user=email,
+                status="pending"
+            )
+            for email in emails
+        ]
+        # The unique index on pending (invited_user, league) rejects duplicates atomically
+        duplicates = Invite.save_many(invites)
+        invites = [invite for invite in invites if invite not in duplicates]
+        skipped = [invite.invited_user for invite in duplicates]
+        if not invites:
+            raise Exception("Invite already sent")
+
+        EmailService.send_custom_emails(
+            recipients=[(invite.invited_user, users[invite.invited_user].name if invite.invited_user in users else invite.invited_user)
+                        for invite in invites],
             subject="You're invited to join a league!",
             message_top="You have been invited to join a league. Log in to your account to accept or decline the invitation. If you're not registered yet, you can sign up to join the league.",
             message_bottom= 'If you have any questions, feel free to reach out to us.',
             button_name="View Invitation",
             url="https://yourapp.com/invites"
         )
-        return invite
-
-    @staticmethod
-    def create_invites(email_list, league_id):
-        invites = []
-        for email in email_list:
-            invites.append(InviteService.create_invite(email, league_id))
-        return invites
+        return invites, skipped
 
 
     @staticmethod
@@ -64,10 +79,9 @@ class InviteService:
 
     @staticmethod
     def accept_invite(invite_id, league_user_name=None):
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         invite = Invite.get_invite_by_id(invite_id)
-        userObj = User.get_user_by_mail(user.email)
+        userObj = UserLoader.current().load(user.email)
         if not invite:
             raise Exception("Invite not found")
         if userObj.email != invite.invited_user:
@@ -82,25 +96,23 @@ class InviteService:
 
     @staticmethod
     def decline_invite(invite_id):
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         invite = Invite.get_invite_by_id(invite_id)
         if user.email != invite.invited_user:
             raise Exception("You are not allowed to reject this invite")
         invite = Invite.get_invite_by_id(invite_id)
         if invite.status != "pending":
             raise Exception("Invite is not pending")
-        invite.status = "declined"
-        invite.save()
+        # Update in place so the invite stops counting as pending
+        invite.decline()
         return invite
 
     @staticmethod
     def delete_invite(invite_id):
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         invite = Invite.get_invite_by_id(invite_id)
-        if user.email != invite.inviter:
+        if not invite.inviter or user.email != invite.inviter.email:
             raise Exception("You are not allowed to delete this invite")
         invite.status = "deleted"
-        invite.save()
+        invite.update()
         return invite
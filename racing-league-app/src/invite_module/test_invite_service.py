@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from src.auth_module.auth_service import AuthService
+from src.auth_module.principal import Principal
+from src.config.indexes import dedupe_pending_invites
+from src.invite_module.invite_service import InviteService
+from src.league_module.league import League
+
+
+@pytest.fixture
+def league(mongo_db, monkeypatch):
+    monkeypatch.setattr(AuthService, "get_current_principal",
+                        staticmethod(lambda: Principal(uid="owner", email="owner@example.com")))
+    mongo_db.users.insert_one({
+        "_id": "owner", "name": "Owner", "email": "owner@example.com", "eaUsername": None,
+        "leagues": [], "races": [], "created_at": None, "updated_at": None, "deleted_at": None
+    })
+    league = League(name="League", owner="owner@example.com", public=True, calendar=[],
+                    pointSystem={}, status="Active")
+    league.save()
+    return league
+
+
+def test_partial_duplicates_are_skipped_and_reported(mongo_db, league):
+    InviteService.create_invites(["a@example.com"], str(league._id))
+
+    invites, skipped = InviteService.create_invites(
+        ["a@example.com", "b@example.com", "b@example.com"], str(league._id))
+
+    assert [invite.invited_user for invite in invites] == ["b@example.com"]
+    assert skipped == ["a@example.com"]
+    assert mongo_db.invites.count_documents({"status": "pending"}) == 2
+    # Only the created invite is emailed
+    assert sorted(message["to"]["email"] for message in mongo_db.email_outbox.find()) == \
+        ["a@example.com", "b@example.com"]
+
+
+def test_all_duplicates_raise(mongo_db, league):
+    InviteService.create_invites(["a@example.com"], str(league._id))
+
+    with pytest.raises(Exception, match="Invite already sent"):
+        InviteService.create_invites(["a@example.com"], str(league._id))
+
+
+def test_declined_invite_does_not_block_a_new_one(mongo_db, league):
+    invites, _ = InviteService.create_invites(["a@example.com"], str(league._id))
+    mongo_db.invites.update_one({"_id": invites[0]._id}, {"$set": {"status": "declined"}})
+
+    invites, skipped = InviteService.create_invites(["a@example.com"], str(league._id))
+
+    assert len(invites) == 1 and skipped == []
+
+
+def test_unique_index_is_created_on_first_write(mongo_db, league):
+    assert "invited_user_1_league_1" not in mongo_db.invites.index_information()
+
+    InviteService.create_invites(["a@example.com"], str(league._id))
+
+    assert mongo_db.invites.index_information()["invited_user_1_league_1"]["unique"]
+
+
+def _insert_duplicate_invites(mongo_db, league, email, count):
+    now = datetime.now(timezone.utc)
+    mongo_db.invites.insert_many([{
+        "league": str(league._id), "invited_user": email, "inviter": "owner@example.com", "status": "pending",
+        "created_at": now + timedelta(minutes=index), "updated_at": None, "deleted_at": None
+    } for index in range(count)])
+
+
+def test_existing_duplicates_do_not_block_invites(mongo_db, league):
+    _insert_duplicate_invites(mongo_db, league, "a@example.com", 2)
+
+    invites, skipped = InviteService.create_invites(["a@example.com", "b@example.com"], str(league._id))
+
+    assert [invite.invited_user for invite in invites] == ["b@example.com"]
+    assert skipped == ["a@example.com"]
+    assert "invited_user_1_league_1" not in mongo_db.invites.index_information()
+
+
+def test_dedupe_keeps_the_oldest_pending_invite(mongo_db, league):
+    _insert_duplicate_invites(mongo_db, league, "a@example.com", 3)
+    oldest = mongo_db.invites.find_one(sort=[("created_at", 1)])["_id"]
+
+    assert dedupe_pending_invites() == 2
+
+    assert [invite["_id"] for invite in mongo_db.invites.find({"status": "pending"})] == [oldest]
+    assert mongo_db.invites.count_documents({"status": "duplicate", "deleted_at": {"$ne": None}}) == 2
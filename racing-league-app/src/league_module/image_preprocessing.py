@@ -0,0 +1,65 @@
+"""
+In-memory preparation of result screenshots for the vision model.
+
+Uploads are validated, decoded at reduced scale when the format allows it
+(JPEG draft mode), downscaled to the resolution the model actually reads and
+re-encoded as JPEG, all without touching the disk.
+"""
+import base64
+from io import BytesIO
+from PIL import Image, UnidentifiedImageError
+from src.config.config import Config
+
+SUPPORTED_FORMATS = ("JPEG", "PNG")
+
+
+def preprocess_image(data, max_dimension=None, quality=None):
+    """
+    Turn an uploaded image into a base64 JPEG sized for the vision model
+
+    Args:
+        data: Raw bytes of the uploaded file
+        max_dimension: Longest side of the output image, defaults to Config.RESULT_IMAGE_MAX_DIMENSION
+        quality: JPEG quality of the output, defaults to Config.RESULT_IMAGE_QUALITY
+
+    Returns:
+        Base64 encoded JPEG
+    """
+    max_dimension = max_dimension or Config.RESULT_IMAGE_MAX_DIMENSION
+    quality = quality or Config.RESULT_IMAGE_QUALITY
+
+    if not data:
+        raise Exception("Empty image provided")
+    if len(data) > Config.RESULT_IMAGE_MAX_BYTES:
+        raise Exception(f"Image too large. Maximum size is {Config.RESULT_IMAGE_MAX_BYTES // (1024 * 1024)} MB")
+
+    try:
+        # Only the header is parsed here; pixels are decoded on first access
+        image = Image.open(BytesIO(data))
+    except UnidentifiedImageError:
+        raise Exception("Invalid image file")
+    except Image.DecompressionBombError:
+        raise Exception("Image resolution too high")
+    if image.format not in SUPPORTED_FORMATS:
+        raise Exception("Invalid file type. Only JPEG and PNG are supported")
+
+    width, height = image.size
+    if width * height > Config.RESULT_IMAGE_MAX_PIXELS:
+        raise Exception("Image resolution too high")
+
+    if image.format == "JPEG":
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale, still at least max_dimension large
+        image.draft("RGB", (max_dimension, max_dimension))
+
+    # Also covers RGBA and palette PNGs, which JPEG cannot store
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+
+def to_data_url(encoded_image):
+    return f"data:image/jpeg;base64,{encoded_image}"
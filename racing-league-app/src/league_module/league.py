@@ -1,11 +1,28 @@
 from bson.objectid import ObjectId
 from src.config.mongo import db
-from datetime import datetime, timezone
+from src.config.config import Config
+from datetime import datetime, timezone, timedelta
 from src.league_module.race import Race
-from src.user_module.user import User
+from src.user_module.user_loader import UserLoader
+from src.league_module.pagination import keyset_filter, split_page
+from src.league_module import standings as standings_engine
+from src.league_module.standings_snapshot import StandingsSnapshot
 
 class League:
-    def __init__(self, name, owner, public, calendar, pointSystem, status, max_players=20, fastestLapPoint=0, _id=None, standings={}, participants=[], admins=[], created_at=None, updated_at=None, deleted_at=None, teams=None):
+    # Attempts at writing race results before giving up on concurrent resubmissions
+    RESULT_WRITE_ATTEMPTS = 3
+
+    # Attributes stored on the league document; assigning one marks it for the next save()
+    PERSISTED_FIELDS = (
+        "name", "owner", "public", "calendar", "pointSystem", "max_players", "fastestLapPoint",
+        "status", "participants", "admins", "standings", "teams", "deleted_at",
+        "next_race_id", "next_race_at", "tieBreakers", "teamStandings"
+    )
+
+    def __init__(self, name, owner, public, calendar, pointSystem, status, max_players=20, fastestLapPoint=0, _id=None, standings={}, participants=[], admins=[], created_at=None, updated_at=None, deleted_at=None, teams=None, next_race_id=None, next_race_at=None, tieBreakers=None, teamStandings=None):
+        # Change tracking is off while the object is being built
+        self._tracking = False
+        self._dirty = set()
         self._id = _id
         self.admins = admins
         self.calendar = calendar
@@ -21,7 +38,10 @@ class League:
         self.standings = standings if standings else {"overall": {}, "races": {}}
         self.updated_at = updated_at
         self.participantsCount = len(participants)
-        self.next_race = self.get_next_race()
+        # Next upcoming race materialized on the document, see refresh_next_race
+        self.next_race_id = next_race_id
+        self.next_race_at = League._as_utc(next_race_at)
+        self.next_race = League.resolve_next_race(self.calendar, self.next_race_id, self.next_race_at)
         self.status = status
         self.teams = teams if teams else {}
         # Teams structure stored in DB:
@@ -29,17 +49,110 @@ class League:
         #     "Red Bull": ["email1@example.com", "email2@example.com"],
         #     "Ferrari": ["email3@example.com"]
         # }
+        # Stats deciding the order of drivers level on points, see standings.rank
+        self.tieBreakers = list(tieBreakers) if tieBreakers else list(standings_engine.DEFAULT_TIE_BREAKERS)
+        # Team aggregates as returned by get_teams, maintained on every write that
+        # affects them; None for leagues stored before they were materialized
+        self.teamStandings = teamStandings
+        self._tracking = True
+
+    def __setattr__(self, name, value):
+        if name in League.PERSISTED_FIELDS and self.__dict__.get('_tracking'):
+            current = self.__dict__.get(name)
+            if name not in self.__dict__ or (current is not value and current != value):
+                self._dirty.add(name)
+        super().__setattr__(name, value)
+
+    def mark_dirty(self, field, *keys):
+        """
+        Mark a persisted field, or a nested path inside it, as modified
+
+        Needed after in-place changes such as self.standings["overall"][email] = ...,
+        which assignment tracking cannot see. Keys that cannot be part of a dotted
+        update path (containing "." or starting with "$", like emails) make the
+        nearest addressable parent dirty instead.
+        """
+        path = [field]
+        for key in keys:
+            key = str(key)
+            if '.' in key or key.startswith('$'):
+                break
+            path.append(key)
+        self._dirty.add('.'.join(path))
+
+    def _mark_clean(self, *fields):
+        """Forget changes that were already written with a targeted update"""
+        self._dirty = {path for path in self._dirty if path.split('.')[0] not in fields}
+
+    def _document_value(self, field):
+        if field == "calendar":
+            return [race.serialize() for race in self.calendar]
+        return getattr(self, field)
+
+    def _dirty_updates(self):
+        """$set document holding only the modified fields, as dotted paths where possible"""
+        updates = {}
+        # Shorter paths sort first, so a dirty parent absorbs its dirty children
+        for path in sorted(self._dirty, key=lambda p: p.count('.')):
+            if any(path.startswith(parent + '.') for parent in updates):
+                continue
+            field, *keys = path.split('.')
+            value = self._document_value(field)
+            for key in keys:
+                value = value[int(key)] if isinstance(value, list) else value[key]
+            updates[path] = value
+        return updates
 
     def get_next_race(self):
         """Find the next upcoming race in the calendar"""
-        if not self.calendar or len(self.calendar) == 0:
+        return League.find_next_race(self.calendar)
+
+    def refresh_next_race(self):
+        """Recompute the materialized next race after the calendar or race statuses changed"""
+        self.next_race = self.get_next_race()
+        self.next_race_id = self.next_race._id if self.next_race else None
+        self.next_race_at = League._as_utc(self.next_race.date) if self.next_race else None
+        return self.next_race
+
+    @staticmethod
+    def _as_utc(value):
+        if not isinstance(value, datetime):
+            return value
+        # MongoDB keeps milliseconds only, so match that or every save sees a change
+        value = value.replace(microsecond=value.microsecond // 1000 * 1000)
+        # MongoDB hands back naive datetimes that are in UTC
+        if not value.tzinfo:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @staticmethod
+    def resolve_next_race(calendar, next_race_id=None, next_race_at=None):
+        """
+        Get the next race using the materialized next_race_id/next_race_at fields
+
+        The calendar is only scanned when the stored race is missing or already
+        in the past, e.g. for documents written before the fields existed.
+        """
+        if next_race_id is not None and next_race_at is not None and next_race_at > datetime.now(timezone.utc):
+            for race in calendar or []:
+                if race._id == next_race_id and race.status == "Upcoming":
+                    return race
+        return League.find_next_race(calendar)
+
+    @staticmethod
+    def find_next_race(calendar):
+        """Find the next upcoming race in a list of Race objects"""
+        if not calendar or len(calendar) == 0:
             return None
 
         next_race = None
         # Make current_time timezone aware
         current_time = datetime.now(timezone.utc)
 
-        for race in self.calendar:
+        for race in calendar:
+            if race.status != "Upcoming":
+                continue
+
             # Ensure race date is a proper datetime object and timezone aware
             race_date = race.date
             if isinstance(race_date, str):
@@ -84,10 +197,19 @@ class League:
 
         return next_race
 
-    def serialize(self):
+    def serialize(self, users=None):
+        """
+        Serialize the league for API responses
+
+        Args:
+            users: Optional dict mapping emails to User objects. When omitted the
+                   referenced users are resolved through the request's UserLoader.
+        """
+        if users is None:
+            users = UserLoader.current().load_many(self.get_referenced_emails())
         calendar_serialized = [race.serialize() for race in self.calendar] if self.calendar else []
         next_race_serialized = self.next_race.serialize() if self.next_race else None
-        detailed_participants = self.get_participants_with_details()
+        detailed_participants = self.get_participants_with_details(users)
 
         result = {
             "_id": str(self._id) if self._id else None,
@@ -98,13 +220,14 @@ class League:
             "pointSystem": self.pointSystem,
             "max_players": self.max_players,
             "fastestLapPoint": self.fastestLapPoint,
-            "standings": self.standings,
+            "standings": self.get_standings(users),
             "participants": detailed_participants,
             "participantsCount": self.participantsCount,
             "next_race": next_race_serialized,
             "status": self.status,
             "admins": self.admins,
-            "teams": self.get_teams(),
+            "teams": self.get_teams(users),
+            "tieBreakers": self.tieBreakers,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
             "deleted_at": self.deleted_at
@@ -114,8 +237,59 @@ class League:
 
         return result
 
-    def get_participants_with_details(self):
-        """Fetch detailed information for all participants"""
+    @staticmethod
+    def serialize_many(leagues):
+        """Serialize a list of leagues resolving every referenced user with one query"""
+        emails = set()
+        for league in leagues:
+            emails.update(league.get_referenced_emails())
+        users = UserLoader.current().load_many(emails)
+        return [league.serialize(users) for league in leagues]
+
+    @staticmethod
+    def _participant_email(participant):
+        # Handle both old format (string) and new format (dict)
+        return participant if isinstance(participant, str) else participant.get('email')
+
+    def get_referenced_emails(self):
+        """Emails of every user the serialized league refers to (participants, drivers in the standings and team members)"""
+        emails = {League._participant_email(p) for p in self.participants}
+        emails.update(self.standings.get("overall", {}))
+        for members in self.teams.values():
+            emails.update(members)
+        emails.discard(None)
+        return emails
+
+    def get_standings(self, users=None):
+        """
+        The standings with each driver's current display name
+
+        Names stored in the overall standings date from when the driver joined,
+        so they are replaced with the users' names at read time.
+
+        Args:
+            users: Optional dict mapping emails to User objects. When omitted the
+                   drivers are resolved through the request's UserLoader.
+        """
+        overall = self.standings.get("overall", {})
+        if users is None:
+            users = UserLoader.current().load_many(overall)
+        return {**self.standings, "overall": {
+            email: {**stats, "name": users[email].name} if users.get(email) else stats
+            for email, stats in overall.items()
+        }}
+
+    def get_participants_with_details(self, users=None):
+        """
+        Fetch detailed information for all participants
+
+        Args:
+            users: Optional dict mapping emails to User objects. When omitted all
+                   participants are resolved through the request's UserLoader.
+        """
+        if users is None:
+            users = UserLoader.current().load_many(League._participant_email(p) for p in self.participants)
+
         participants_with_details = []
 
         for participant in self.participants:
@@ -127,7 +301,7 @@ class League:
                 email = participant.get('email')
                 league_user_name = participant.get('league_user_name')
             
-            user = User.get_user_by_mail(email)
+            user = users.get(email)
             if user:
                 participants_with_details.append({
                     "email": email,
@@ -155,49 +329,31 @@ class League:
         """Save or update the league in MongoDB"""
         self.participantsCount = len(self.participants)
         self.updated_at = datetime.now(timezone.utc)
+        self.refresh_next_race()
+        self.refresh_team_standings()
+        # Snapshots are keyed by calendar order, so reordered, added or removed races invalidate them
+        rebuild_snapshots = bool(self._id) and any(path.split('.')[0] == "calendar" for path in self._dirty)
 
         if self._id:
-            # Update existing league
+            # Update existing league, sending only what changed since it was loaded
+            updates = self._dirty_updates()
+            updates["updated_at"] = self.updated_at
             db.leagues.update_one(
                 {"_id": self._id},
-                {"$set": {
-                    "name": self.name,
-                    "owner": self.owner,
-                    "public": self.public,
-                    "calendar": [race.serialize() for race in self.calendar],
-                    "pointSystem": self.pointSystem,
-                    "max_players": self.max_players,
-                    "fastestLapPoint": self.fastestLapPoint,
-                    "status": self.status,
-                    "updated_at": self.updated_at,
-                    "participants": self.participants,
-                    "admins": self.admins,
-                    "standings": self.standings,
-                    "teams": self.teams
-                }}
+                {"$set": updates}
             )
         else:
             # Create new league
-            league = {
-                "name": self.name,
-                "owner": self.owner,
-                "public": self.public,
-                "calendar": [race.serialize() for race in self.calendar],
-                "pointSystem": self.pointSystem,
-                "max_players": self.max_players,
-                "fastestLapPoint": self.fastestLapPoint,
-                "standings": self.standings,
-                "participants": self.participants,
-                "admins": self.admins,
-                "status": self.status,
-                "teams": self.teams,
-                "created_at": self.created_at,
-                "updated_at": self.updated_at,
-                "deleted_at": self.deleted_at,
-            }
+            league = {field: self._document_value(field) for field in League.PERSISTED_FIELDS}
+            league["created_at"] = self.created_at
+            league["updated_at"] = self.updated_at
             result = db.leagues.insert_one(league)
             self._id = result.inserted_id
 
+        self._dirty.clear()
+        if rebuild_snapshots:
+            StandingsSnapshot.rebuild(self)
+
     def add_race_result(self, race_id, results):
         """
         Add race results to standings with extended statistics
@@ -212,13 +368,38 @@ class League:
                         'wins': 1,
                         'podiums': 1
                     }}
+
+        Raises:
+            Exception: If the race's results keep changing concurrently
         """
         race_id = str(race_id)
+        for attempt in range(League.RESULT_WRITE_ATTEMPTS):
+            if attempt:
+                # Another submission changed this race since the league was loaded
+                self._reload()
+            if self._write_race_result(race_id, results):
+                break
+        else:
+            raise Exception("Race results were changed concurrently, please try again")
+
+        # Cumulative standings after this race (and after any later race it changes)
+        StandingsSnapshot.record(self, race_id)
 
+        return self.standings
+
+    def _write_race_result(self, race_id, results):
+        """
+        Apply race results in memory and persist them with one conditional update
+
+        Returns:
+            False if the stored results of the race no longer match the loaded ones,
+            in which case nothing was written
+        """
         # Initialize race results if not exists
         if "races" not in self.standings:
             self.standings["races"] = {}
 
+        previous_results = self.standings["races"].get(race_id)
         self.standings["races"][race_id] = {}
 
         # Process each participant's result
@@ -244,8 +425,12 @@ class League:
                 "podiums": result.get('podiums', 0)
             }
 
-        # Recalculate overall standings
-        self.calculate_overall_standings()
+        # Apply only this race's contribution (minus a previous submission of it) to the overall standings
+        deltas = standings_engine.race_delta(previous_results, self.standings["races"][race_id])
+        standings_engine.apply_delta(self.standings.setdefault("overall", {}), deltas)
+        # Rank once here so readers never sort the standings; the update ranks the stored copy the same way
+        standings_engine.assign_positions(self.standings["overall"], self.tieBreakers)
+        self.refresh_team_standings()
 
         # Change race status to completed
         for race in self.calendar:
@@ -253,13 +438,54 @@ class League:
                 race.status = "Completed"
                 break
 
-        # Save changes to database
-        self.save()
+        self.updated_at = datetime.now(timezone.utc)
+        self.refresh_next_race()
 
-        return self.standings
+        # Persist the race results and the per-driver increments without rewriting the league
+        # Applied only if the race's results are still the ones the delta was computed from
+        stored_results = previous_results if previous_results is not None else {"$exists": False}
+        update = db.leagues.update_one(
+            {"_id": self._id, f"standings.races.{race_id}": stored_results},
+            [
+                standings_engine.set_field_stage("standings.races", race_id, {"$literal": self.standings["races"][race_id]}),
+                *standings_engine.overall_delta_stages(deltas),
+                standings_engine.positions_stage(self.tieBreakers),
+                *standings_engine.team_standings_stages(self.team_member_names()),
+                {"$set": {
+                    "calendar": {"$map": {
+                        "input": {"$ifNull": ["$calendar", []]},
+                        "as": "race",
+                        "in": {"$cond": [
+                            {"$eq": [{"$toString": "$$race._id"}, race_id]},
+                            {"$mergeObjects": ["$$race", {"status": "Completed"}]},
+                            "$$race"
+                        ]}
+                    }},
+                    "next_race_id": {"$literal": self.next_race_id},
+                    "next_race_at": {"$literal": self.next_race_at},
+                    "updated_at": {"$literal": self.updated_at}
+                }}
+            ]
+        )
+        if not update.matched_count:
+            return False
+        self._mark_clean("standings", "calendar", "next_race_id", "next_race_at", "teamStandings")
+        return True
+
+    def _reload(self):
+        """Replace the in-memory state with the stored league"""
+        league_data = db.leagues.find_one({"_id": self._id})
+        if not league_data:
+            raise Exception("League not found")
+        self.__dict__.update(League._create_league_from_document(league_data).__dict__)
 
     def calculate_overall_standings(self):
-        """Recalculate overall standings with extended statistics based on all race results"""
+        """
+        Recalculate overall standings with extended statistics based on all race results
+
+        Result submission updates standings incrementally; this full recomputation
+        is kept for repairing standings.
+        """
         overall = {}
 
         # Initialize all participants with zero values for all stats
@@ -294,15 +520,42 @@ class League:
                     overall[participant]["dnfs"] += 1 if result.get("dnf", False) else 0
                     overall[participant]["fastestLaps"] += 1 if result.get("fastest_lap", False) else 0
 
+        standings_engine.assign_positions(overall, self.tieBreakers)
         self.standings["overall"] = overall
+        self.mark_dirty("standings", "overall")
+        # Team totals are derived from the overall standings
+        self.refresh_team_standings()
+        self.mark_dirty("teamStandings")
         return overall
 
+    @staticmethod
+    def get_position_in_standings(overall, email, tie_breakers=None):
+        """
+        Championship position of a participant given the overall standings
+
+        Reads the position stored when the standings were written and only ranks
+        the standings for entries written before positions were stored.
+        """
+        entry = overall.get(email)
+        if entry is None:
+            return 1
+        if "position" in entry:
+            return entry["position"]
+        return standings_engine.rank(overall, tie_breakers).get(email, 1)
+
     def get_participant_standings(self, participant):
         """Get standings for a specific participant"""
+        overall = self.standings.get("overall", {})
         results = {
-            "overall": self.standings.get("overall", {}).get(participant, 0),
+            "overall": overall.get(participant, 0),
             "races": {}
         }
+        if isinstance(results["overall"], dict) and "position" not in results["overall"]:
+            # Standings written before positions were stored
+            results["overall"] = {
+                **results["overall"],
+                "position": League.get_position_in_standings(overall, participant, self.tieBreakers)
+            }
 
         if "races" in self.standings:
             for race_id, race_results in self.standings["races"].items():
@@ -318,18 +571,101 @@ class League:
             {"$set": {"deleted_at": datetime.now(timezone.utc)}}
         )
 
+    # Filters of the league listing endpoints
+    ALL_LEAGUES_FILTER = {"deleted_at": None, "public": True}
+    PUBLIC_LEAGUES_FILTER = {"deleted_at": None, "public": True}
+
     @staticmethod
     def get_all_leagues():
-        leagues = db.leagues.find({
-            "deleted_at": None,
-            "public": True
-        })
+        leagues = db.leagues.find(League.ALL_LEAGUES_FILTER)
         return [League._create_league_from_document(league) for league in leagues]
     
     @staticmethod
-    def get_all_leagues_pagination(page=1, page_size=10):
-        leagues = db.leagues.find().skip((page - 1) * page_size).limit(page_size)
-        return [League._create_league_from_document(league) for league in leagues]
+    def refresh_stale_next_races(match=None):
+        """
+        Recompute next_race_id/next_race_at on documents where it is outdated
+
+        A stored next race goes stale when its date passes without results being
+        submitted; documents written before the fields existed are backfilled.
+        Run periodically by the web app (see next_race_refresh) or by
+        scripts/backfill_next_race.py, never from read paths.
+
+        Returns:
+            Number of leagues updated
+        """
+        stale = {"$or": [
+            {"next_race_at": {"$lt": datetime.now(timezone.utc)}},
+            {"next_race_at": {"$exists": False}}
+        ]}
+        query = {"$and": [match, stale]} if match else stale
+        updated = 0
+        for league_data in db.leagues.find(query, {"calendar": 1}):
+            calendar = [Race.deserialize(race_data) for race_data in league_data.get('calendar') or []]
+            next_race = League.find_next_race(calendar)
+            db.leagues.update_one(
+                {"_id": league_data['_id']},
+                {"$set": {
+                    "next_race_id": next_race._id if next_race else None,
+                    "next_race_at": League._as_utc(next_race.date) if next_race else None
+                }}
+            )
+            updated += 1
+        return updated
+
+    @staticmethod
+    def racing_within_filter(hours=24):
+        """Filter matching leagues whose next race starts within the given number of hours"""
+        now = datetime.now(timezone.utc)
+        return {
+            "deleted_at": None,
+            "next_race_at": {"$gte": now, "$lt": now + timedelta(hours=hours)}
+        }
+
+    @staticmethod
+    def participant_filter(email):
+        """Filter matching leagues the user participates in, in either participant format"""
+        return {
+            "$or": [
+                {"participants": {"$in": [email]}},  # Old format
+                {"participants.email": email}  # New format
+            ]
+        }
+
+    @staticmethod
+    def get_next_race_for_participant(email):
+        """
+        Get the soonest upcoming race across every league the user participates in
+
+        Only the materialized next_race_at is read; a league whose race passed
+        without results shows up again once refresh_stale_next_races has run.
+
+        Returns:
+            The League holding the race, or None; its next_race attribute is the race
+        """
+        match = {"$and": [League.participant_filter(email), {"deleted_at": None}]}
+        league_data = db.leagues.find_one(
+            {"$and": [match, {"next_race_at": {"$gte": datetime.now(timezone.utc)}}]},
+            sort=[("next_race_at", 1)]
+        )
+        if league_data:
+            return League._create_league_from_document(league_data)
+        return None
+
+    @staticmethod
+    def get_leagues_page(match, cursor=None, limit=20):
+        """
+        Cursor-paginated listing, newest leagues first
+
+        Args:
+            match: MongoDB filter on the leagues collection
+            cursor: Opaque token returned with the previous page, None for the first page
+            limit: Maximum number of leagues on the page
+
+        Returns:
+            Tuple of (leagues, next cursor or None on the last page)
+        """
+        leagues = db.leagues.find(keyset_filter(match, cursor)).sort("_id", -1).limit(limit + 1)
+        return split_page([League._create_league_from_document(league) for league in leagues], limit)
     
     @staticmethod
     def get_leagues_by_owner(owner_email):
@@ -341,12 +677,7 @@ class League:
         # Query supports both old format (string array) and new format (object array)
         agg = [
             {
-            "$match": {
-                "$or": [
-                    {"participants": {"$in": [participant_email]}},  # Old format
-                    {"participants.email": participant_email}  # New format
-                ]
-            }
+            "$match": League.participant_filter(participant_email)
             }
         ]
         leagues = db.leagues.aggregate(agg)
@@ -354,7 +685,7 @@ class League:
     
     @staticmethod
     def get_public_leagues():
-        leagues = db.leagues.find({"public": True})
+        leagues = db.leagues.find(League.PUBLIC_LEAGUES_FILTER)
         return [League._create_league_from_document(league) for league in leagues]
 
     def add_participant(self, participant_email, user_name=None, league_user_name=None):
@@ -392,11 +723,12 @@ class League:
             "fastestLaps": 0
         }
 
+        # A new driver on zero points can tie with or rank below others
+        standings_engine.assign_positions(self.standings["overall"], self.tieBreakers)
+
         # Update standings in database
-        db.leagues.update_one(
-            {"_id": self._id},
-            {"$set": {"standings": self.standings}}
-        )
+        self.mark_dirty("standings", "overall")
+        self.save()
 
         # Update participant count
         self.participantsCount = len(self.participants)
@@ -437,6 +769,7 @@ class League:
             self.participants = [p for p in self.participants 
                                if (p if isinstance(p, str) else p.get('email')) != participant_email]
             self.participantsCount = len(self.participants)
+            self._mark_clean("participants")
 
     def set_teams(self, teams_config):
         """
@@ -480,18 +813,29 @@ class League:
         
         # All validations passed, update teams
         self.teams = teams_config
+        # Member names are resolved afresh whenever teams are set
+        self.refresh_team_standings(reload_names=True)
         
         # Save to database
         db.leagues.update_one(
             {"_id": self._id},
-            {"$set": {"teams": self.teams}}
+            {"$set": {"teams": self.teams, "teamStandings": self.teamStandings}}
         )
+        self._mark_clean("teams", "teamStandings")
         
         return self.teams
 
-    def get_teams(self):
+    def get_teams(self, users=None):
         """
         Get all teams with calculated total points from member standings
+
+        Reads the stored team totals; only leagues stored before they were
+        materialized are aggregated on the fly. Member names are resolved at read
+        time, so renamed members do not keep the name stored with the totals.
+
+        Args:
+            users: Optional dict mapping emails to User objects, used for member names.
+                   When omitted team members are resolved through the request's UserLoader.
         
         Returns:
             Dict with team details and aggregated statistics
@@ -506,16 +850,68 @@ class League:
                     "member_details": [
                         {"email": "email1", "name": "John", "points": 100, ...},
                         {"email": "email2", "name": "Jane", "points": 50, ...}
-                    ]
+                    ],
+                    "position": 1
                 }
             }
         """
+        if users is None:
+            users = UserLoader.current().load_many(
+                member for members in self.teams.values() for member in members
+            )
+        names = {email: user.name for email, user in users.items() if user}
+        if not self.has_team_standings():
+            return self.compute_team_standings(names)
+
+        # Totals are stored; names are resolved now so renamed members show their new name
+        return {
+            team_name: {**team, "member_details": [
+                {**member, "name": names.get(member["email"]) or member["name"]}
+                for member in team.get("member_details", [])
+            ]}
+            for team_name, team in self.teamStandings.items()
+        }
+
+    def has_team_standings(self):
+        """Whether the stored team standings cover the current teams"""
+        return self.teamStandings is not None and set(self.teamStandings) == set(self.teams)
+
+    def refresh_team_standings(self, reload_names=False):
+        """
+        Recompute the stored team standings from the overall standings
+
+        Member names already stored are reused, so only members new to a team
+        are looked up (with a single load_many) unless reload_names is set.
+        """
+        names = {} if reload_names else self.team_member_names()
+        missing = {member for members in self.teams.values() for member in members} - set(names)
+        if missing:
+            users = UserLoader.current().load_many(missing)
+            names.update({email: user.name for email, user in users.items() if user})
+        self.teamStandings = self.compute_team_standings(names)
+        return self.teamStandings
+
+    def team_member_names(self):
+        """Display names of team members as stored on the team standings"""
+        return {
+            member["email"]: member["name"]
+            for team in (self.teamStandings or {}).values()
+            for member in team.get("member_details", [])
+        }
+
+    def compute_team_standings(self, names):
+        """
+        Aggregate team totals from the overall standings
+
+        Args:
+            names: Dict mapping member emails to display names; missing members show their email
+        """
         teams_with_stats = {}
         overall_standings = self.standings.get("overall", {})
         
         for team_name, members in self.teams.items():
             team_stats = {
-                "members": members,
+                "members": list(members),
                 "total_points": 0,
                 "total_wins": 0,
                 "total_podiums": 0,
@@ -535,8 +931,7 @@ class League:
                 })
                 
                 # Get member's name
-                user = User.get_user_by_mail(member_email)
-                member_name = user.name if user else member_email
+                member_name = names.get(member_email) or member_email
                 
                 # Aggregate team totals
                 team_stats["total_points"] += member_standings.get("points", 0)
@@ -557,6 +952,16 @@ class League:
                 })
             
             teams_with_stats[team_name] = team_stats
+
+        # Leaderboard order: points, then wins, then podiums
+        ordered = sorted(
+            teams_with_stats,
+            key=lambda name: (teams_with_stats[name]["total_points"], teams_with_stats[name]["total_wins"],
+                              teams_with_stats[name]["total_podiums"]),
+            reverse=True
+        )
+        for i, team_name in enumerate(ordered):
+            teams_with_stats[team_name]["position"] = i + 1
         
         return teams_with_stats
 
@@ -569,17 +974,10 @@ class League:
         """
         teams_with_stats = self.get_teams()
         
-        sorted_teams = sorted(
+        return sorted(
             [{"name": name, **stats} for name, stats in teams_with_stats.items()],
-            key=lambda x: (x["total_points"], x["total_wins"], x["total_podiums"]),
-            reverse=True
+            key=lambda x: x["position"]
         )
-        
-        # Add position
-        for i, team in enumerate(sorted_teams):
-            team["position"] = i + 1
-        
-        return sorted_teams
 
     def get_participant_team(self, participant_email):
         """Get the team name a participant belongs to"""
@@ -592,10 +990,12 @@ class League:
         """Remove a team by name"""
         if team_name in self.teams:
             del self.teams[team_name]
+            self.refresh_team_standings()
             db.leagues.update_one(
                 {"_id": self._id},
-                {"$unset": {f"teams.{team_name}": ""}}
+                {"$unset": {f"teams.{team_name}": ""}, "$set": {"teamStandings": self.teamStandings}}
             )
+            self._mark_clean("teams", "teamStandings")
 
     @staticmethod
     def _create_league_from_document(league_data):
@@ -621,5 +1021,9 @@ class League:
             created_at=league_data.get('created_at', datetime.now(timezone.utc)),
             updated_at=league_data.get('updated_at'),
             deleted_at=league_data.get('deleted_at'),
-            teams=league_data.get('teams', {})
+            teams=league_data.get('teams', {}),
+            next_race_id=league_data.get('next_race_id'),
+            next_race_at=league_data.get('next_race_at'),
+            tieBreakers=league_data.get('tieBreakers'),
+            teamStandings=league_data.get('teamStandings')
         )
\ No newline at end of file
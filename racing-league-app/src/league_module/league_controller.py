@@ -1,37 +1,64 @@
 from flask import Blueprint, request, jsonify
 from src.auth_module.auth_service import login_required
 from src.league_module.league import League
+from src.league_module.league_summary import LeagueSummary
+from src.league_module.pagination import parse_limit
 from src.league_module.league_service import LeagueService
 from src.auth_module.auth_service import AuthService
-from firebase_admin import auth
-import io
-from PIL import Image
+from src.league_module.image_preprocessing import preprocess_image
 
-from src.user_module.user import User
+from src.user_module.user_loader import UserLoader
 
 league_blueprint = Blueprint('league', __name__, url_prefix='/api/v1/leagues')
 
-@league_blueprint.route('/all', methods=['GET'])
-def get_all_leagues():
-    leagues = League.get_all_leagues()
-    return jsonify([league.serialize() for league in leagues]), 200
+def wants_summary():
+    """List endpoints return LeagueSummary payloads when called with ?view=summary"""
+    return request.args.get('view') == 'summary'
 
-@league_blueprint.route('/<int:page>/<int:page_size>', methods=['GET'])
-@login_required
-def get_all_leagues_page(page, page_size):
-    leagues = League.get_all_leagues_pagination(page, page_size)
+def get_leagues_page(match):
+    """Serve one cursor-paginated page of the leagues matching the filter"""
+    try:
+        cursor = request.args.get('cursor')
+        limit = parse_limit(request.args.get('limit'))
+        if wants_summary():
+            leagues, next_cursor = LeagueSummary.get_leagues_page(match, cursor, limit)
+            leagues = LeagueSummary.serialize_many(leagues)
+        else:
+            leagues, next_cursor = League.get_leagues_page(match, cursor, limit)
+            leagues = League.serialize_many(leagues)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     return jsonify({
-        'page': page,
-        'page_size': page_size,
-        'leagues': [league.serialize() for league in leagues]
+        'limit': limit,
+        'next_cursor': next_cursor,
+        'leagues': leagues
         }), 200
 
+@league_blueprint.route('', methods=['GET'])
+@login_required
+def list_leagues():
+    """Cursor-paginated league listing: ?limit=<n>&cursor=<next_cursor of the previous page>"""
+    return get_leagues_page(League.ALL_LEAGUES_FILTER)
+
+@league_blueprint.route('/all', methods=['GET'])
+def get_all_leagues():
+    """Cursor-paginated like GET /api/v1/leagues, but open to signed-out visitors"""
+    return get_leagues_page(League.ALL_LEAGUES_FILTER)
+
+@league_blueprint.route('/upcoming', methods=['GET'])
+def get_upcoming_leagues():
+    """Public leagues racing within the next ?hours= hours (default 24)"""
+    hours = request.args.get('hours', 24, type=int)
+    leagues = LeagueSummary.get_leagues_racing_within(hours)
+    return jsonify(LeagueSummary.serialize_many(leagues)), 200
 
 @league_blueprint.route('/my', methods=['GET'])
 @login_required
 def get_my_leagues():
+    if wants_summary():
+        return jsonify(LeagueSummary.serialize_many(LeagueService.get_my_league_summaries())), 200
     leagues = LeagueService.get_my_leagues()
-    return jsonify([league.serialize() for league in leagues]), 200
+    return jsonify(League.serialize_many(leagues)), 200
 
 @league_blueprint.route('', methods=['POST'])
 @login_required
@@ -59,19 +86,17 @@ def get_league(league_id):
 def update_league(league_id):
     data = request.json
     league = League.get_league_by_id(league_id)
-    uid = AuthService.get_current_user()
-    current_user = auth.get_user(uid)
+    current_user = AuthService.get_current_principal()
     if current_user.email is league.owner or current_user.email not in league.admins:
         return jsonify({"message": "You are not authorized to update this league"}), 403
-    league = LeagueService.update_league(league_id, data)
+    league = LeagueService.update_league(league, data)
     return jsonify(league.serialize()), 200
 
 @league_blueprint.route('/<league_id>', methods=['DELETE'])
 @login_required
 def delete_league(league_id):
-    uid = AuthService.get_current_user()
+    current_user = AuthService.get_current_principal()
     league = League.get_league_by_id(league_id)
-    current_user = auth.get_user(uid)
     if current_user.email is league.owner or current_user.email not in league.admins:
         return jsonify({"message": "You are not authorized to delete this league"}), 403
     League.delete_league(league_id)
@@ -79,16 +104,14 @@ def delete_league(league_id):
 
 @league_blueprint.route('/public', methods=['GET'])
 def get_public_leagues():
-    leagues = League.get_public_leagues()
-    return jsonify([league.serialize() for league in leagues]), 200
+    return get_leagues_page(League.PUBLIC_LEAGUES_FILTER)
 
 @league_blueprint.route('/<league_id>/join', methods=['POST'])
 @login_required
 def join_league(league_id):
-    uid = AuthService.get_current_user()
-    user = auth.get_user(uid)
+    user = AuthService.get_current_principal()
     league = League.get_league_by_id(league_id)
-    userObj = User.get_user_by_mail(user.email)
+    userObj = UserLoader.current().load(user.email)
     if league.public:
         league.add_participant(userObj.email, userObj.name)
         return jsonify({"message": "You have joined the league!"}), 200
@@ -97,8 +120,7 @@ def join_league(league_id):
 @league_blueprint.route('/<league_id>/leave', methods=['POST'])
 @login_required
 def leave_league(league_id):
-    uid = AuthService.get_current_user()
-    user = auth.get_user(uid)
+    user = AuthService.get_current_principal()
     league = League.get_league_by_id(league_id)
     league.remove_participant(user.email)
     return jsonify({"message": "You have left the league!"}), 200
@@ -109,8 +131,7 @@ def submit_race_results(league_id, race_id):
     """Submit results for a race"""
     try:
         # Check if user is league admin or owner
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         league = LeagueService.get_league_by_id(league_id)
 
         if not league:
@@ -135,8 +156,7 @@ def extract_race_results(league_id, race_id):
     try:
 
         # Check if user is league admin or owner
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         league = LeagueService.get_league_by_id(league_id)
         if not league:
             return jsonify({"message": "League not found"}), 404
@@ -155,16 +175,42 @@ def extract_race_results(league_id, race_id):
             # Ensure the file is an image
             if img.mimetype not in ['image/jpeg', 'image/png']:
                 return jsonify({"message": "Invalid file type. Only JPEG and PNG are supported"}), 400
-            image = Image.open(io.BytesIO(img.read()))
-            if image.mode == "RGBA":
-                # Convert the image to RGB mode
-                image = image.convert("RGB")
-            image_list.append(image)
+            # Validated, downscaled and re-encoded in memory
+            image_list.append(preprocess_image(img.read()))
+
+        if request.args.get('async') == 'true':
+            # Return right away; the result is polled from the extraction job endpoint
+            job_id = LeagueService.submit_race_results_extraction(league_id, race_id, image_list)
+            return jsonify({"job_id": str(job_id), "status": "queued"}), 202
 
         results = LeagueService.extract_race_results(image_list)
 
         return jsonify(results), 200
 
+    except Exception as e:
+        if str(e) == "Too many extraction jobs in progress":
+            return jsonify({"message": str(e)}), 429
+        return jsonify({"message": str(e)}), 400
+
+
+@league_blueprint.route('/<league_id>/extraction-jobs/<job_id>', methods=['GET'])
+@login_required
+def get_extraction_job(league_id, job_id):
+    """Status and, once done, results of an asynchronous result extraction"""
+    try:
+        user = AuthService.get_current_principal()
+        league = LeagueService.get_league_by_id(league_id)
+        if not league:
+            return jsonify({"message": "League not found"}), 404
+
+        if user.email != league.owner and user.email not in league.admins:
+            return jsonify({"message": "Not authorized to extract results"}), 403
+
+        job = LeagueService.get_extraction_job(league_id, job_id)
+        if not job:
+            return jsonify({"message": "Extraction job not found"}), 404
+        return jsonify(job), 200
+
     except Exception as e:
         return jsonify({"message": str(e)}), 400
 
@@ -180,6 +226,19 @@ def get_league_standings(league_id):
         return jsonify({"message": str(e)}), 400
 
 
+@league_blueprint.route('/<league_id>/standings/progression', methods=['GET'])
+@login_required
+def get_standings_progression(league_id):
+    """Cumulative standings after each race, or after race ?after=<n> (1-based calendar order)"""
+    after = request.args.get('after', type=int)
+    if after is None:
+        return jsonify(LeagueService.get_standings_progression(league_id)), 200
+    snapshot = LeagueService.get_standings_progression(league_id, after)
+    if not snapshot:
+        return jsonify({"message": "No standings after this race"}), 404
+    return jsonify(snapshot), 200
+
+
 @league_blueprint.route('/<league_id>/standings/<participant_email>', methods=['GET'])
 @login_required
 def get_participant_standings(league_id, participant_email):
@@ -204,8 +263,7 @@ def set_teams(league_id):
     }
     """
     try:
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         league = LeagueService.get_league_by_id(league_id)
         
         if not league:
@@ -254,8 +312,7 @@ def get_team_standings(league_id):
 def remove_team(league_id, team_name):
     """Remove a team from the league"""
     try:
-        uid = AuthService.get_current_user()
-        user = auth.get_user(uid)
+        user = AuthService.get_current_principal()
         league = LeagueService.get_league_by_id(league_id)
         
         if not league:
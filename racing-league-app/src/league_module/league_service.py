@@ -1,34 +1,19 @@
 from src.league_module.league import League
+from src.league_module.race import Race
+from src.league_module.league_summary import LeagueSummary
+from src.league_module.standings_snapshot import StandingsSnapshot
+from src.league_module import standings as standings_engine
 from src.auth_module.auth_service import AuthService
-from src.config.config import Config
-from firebase_admin import auth
-import tempfile
-from io import BytesIO
-import base64
-
-client = None
-
-def get_openai_client():
-    global client
-    if client is None:
-        try:
-            from openai import OpenAI
-            if not Config.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not found in environment variables")
-            client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        except ImportError as e:
-            raise ImportError(f"OpenAI package not installed: {e}")
-        except Exception as e:
-            raise Exception(f"Failed to initialize OpenAI client: {e}")
-    return client
+from src.extraction_module.extraction_service import ExtractionService
 
 class LeagueService:
     
     @staticmethod
     def create_league(data):
-        uid = AuthService.get_current_user()
-        owner = auth.get_user(uid)
+        owner = AuthService.get_current_principal()
         data["owner"] = owner.email
+        if data.get("tieBreakers") is not None:
+            data["tieBreakers"] = standings_engine.validate_tie_breakers(data["tieBreakers"])
 
         # Convert date strings to datetime objects for calendar entries
         if 'calendar' in data and data['calendar']:
@@ -47,12 +32,13 @@ class LeagueService:
 
         # Convert participants from email strings to objects with email and league_user_name
         if 'participants' in data and data['participants']:
-            from src.user_module.user import User
+            from src.user_module.user_loader import UserLoader
+            users = UserLoader.current().load_many(p for p in data['participants'] if isinstance(p, str))
             new_participants = []
             for participant in data['participants']:
                 if isinstance(participant, str):
                     # Old format - convert to new format
-                    user = User.get_user_by_mail(participant)
+                    user = users.get(participant)
                     league_user_name = user.name if user else participant
                     new_participants.append({
                         "email": participant,
@@ -71,7 +57,9 @@ class LeagueService:
     def update_league(league: League, data):
         league.name = data.get('name')
         league.public = data.get('public')
-        league.calendar = data.get('calendar')
+        # Races keep their _id when sent back, so their results and snapshots follow them
+        league.calendar = [race if isinstance(race, Race) else Race.deserialize(race)
+                           for race in data.get('calendar') or []]
         league.pointSystem = data.get('pointSystem')
         league.fastestLapPoint = data.get('fastestLapPoint')
         league.save()
@@ -79,8 +67,7 @@ class LeagueService:
 
     @staticmethod
     def get_my_leagues():
-        uid = AuthService.get_current_user()
-        owner = auth.get_user(uid)
+        owner = AuthService.get_current_principal()
         email = owner.email
 
         # Get leagues owned by the user
@@ -104,32 +91,20 @@ class LeagueService:
         for league in leagues:
             # Get standings info for each league
             if "overall" in league.standings:
-                # Get all participants' points and sort them in descending order
-                points_list = [(participant, data.get('points', 0)) for participant, data in
-                               league.standings["overall"].items()]
-                points_list.sort(key=lambda x: x[1], reverse=True)
-
-                # Find user's position
-                position = 1
-                for i, (participant_email, points) in enumerate(points_list):
-                    if participant_email == email:
-                        # Handle ties (same points get same position)
-                        if i > 0 and points_list[i - 1][1] == points:
-                            # If tied with previous participant, use their position
-                            position = next((j for j, (_, p) in enumerate(points_list)
-                                             if p == points), i) + 1
-                        else:
-                            position = i + 1
-                        break
-
                 # Add position info to league object
-                league.position = position
+                league.position = League.get_position_in_standings(league.standings["overall"], email, league.tieBreakers)
             else:
                 # No standings data yet
                 league.position = None
 
         return leagues
     
+    @staticmethod
+    def get_my_league_summaries():
+        """Summaries of the leagues the current user owns or participates in"""
+        owner = AuthService.get_current_principal()
+        return LeagueSummary.get_leagues_by_user(owner.email)
+
     @staticmethod
     def get_leagues_by_participant(email):
         return League.get_leagues_by_participant(email)
@@ -196,7 +171,23 @@ class LeagueService:
         if not league:
             raise Exception("League not found")
 
-        return league.standings
+        return league.get_standings()
+
+    @staticmethod
+    def get_standings_progression(league_id, after=None):
+        """
+        Standings snapshots of a league, race by race
+
+        Args:
+            league_id: The ID of the league
+            after: Optional 1-based race order; only the standings after that race are returned
+
+        Returns:
+            List of snapshots, or a single snapshot (None before the first result) when after is given
+        """
+        if after is not None:
+            return StandingsSnapshot.get_after_race(league_id, after)
+        return StandingsSnapshot.get_progression(league_id)
 
     @staticmethod
     def get_participant_standings(league_id, participant_email):
@@ -262,89 +253,21 @@ class LeagueService:
         return {"message": f"Team '{team_name}' removed successfully"}
 
     @staticmethod
-    def extract_race_results(image_files):
-        # Save temp files and create OpenAI image URL objects
-        image_data = []
-        temp_files = []
-
-        for file in image_files:
-            temp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-            file.save(temp.name)
-            temp_files.append(temp.name)
-
-            # Convert Image to base64 string
-            buffer = BytesIO()
-            file.save(buffer, format="JPEG")
-            buffer.seek(0)
-            encoded_image = base64.b64encode(buffer.read()).decode('utf-8')
-
-            image_data.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{encoded_image}"
-                }
-            })
-
-        # Prompt to extract structured results
-        prompt = """
-        Analyze the image(s) and extract any race result tables or listings.
-
-        Return the data in JSON format like this:
-        [
-          {
-            "position": 1,
-            "driver": "Name",
-            "team": "Team Name",
-            "time": "1:23.456"
-          },
-          ...
-        ]
-        If information is missing, fill only what is available.
+    def extract_race_results(encoded_images):
         """
+        Extract race results from screenshots with the vision model
 
-        # Create messages with system prompt and images
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an AI assistant that extracts structured data from images."
-            },
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    *image_data
-                ]
-            }
-        ]        # Make API call with correct format
-        client = get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages
-        )
-
-        # Extract and parse JSON from the response
-        content = response.choices[0].message.content
-        
-        # Clean up the response - remove markdown code blocks if present
-        import json
-        import re
-        
-        # Remove ```json and ``` markers
-        json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-        if json_match:
-            json_string = json_match.group(1)
-        else:
-            # If no markdown blocks, assume the entire content is JSON
-            json_string = content
-        
-        try:
-            # Parse the JSON string into a Python object
-            race_results = json.loads(json_string)
-            return race_results
-        except json.JSONDecodeError as e:
-            # If parsing fails, return the original string with error info
-            return {
-                "error": "Failed to parse JSON",
-                "raw_content": content,
-                "json_error": str(e)
-            }
\ No newline at end of file
+        Args:
+            encoded_images: Base64 JPEGs produced by image_preprocessing.preprocess_image
+        """
+        return ExtractionService.extract_results(encoded_images)
+
+    @staticmethod
+    def submit_race_results_extraction(league_id, race_id, encoded_images):
+        """Queue the extraction in the background and return the job id"""
+        user = AuthService.get_current_principal()
+        return ExtractionService.submit_job(league_id, race_id, user.email, encoded_images)
+
+    @staticmethod
+    def get_extraction_job(league_id, job_id):
+        return ExtractionService.get_job(league_id, job_id)
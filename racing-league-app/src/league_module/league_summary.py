@@ -0,0 +1,139 @@
+from bson.objectid import ObjectId
+from src.config.mongo import db
+from src.league_module.league import League
+from src.league_module.race import Race
+from src.league_module.pagination import keyset_filter, split_page
+
+
+class LeagueSummary:
+    """
+    Lightweight, read-only view of a league for list endpoints.
+
+    Summaries are loaded with a Mongo projection: race results, teams and
+    participant details are never fetched, and no user lookups are made.
+    The full league stays available through League.get_league_by_id.
+    """
+
+    PROJECTION = {
+        "name": 1,
+        "owner": 1,
+        "public": 1,
+        "status": 1,
+        "max_players": 1,
+        "calendar": 1,
+        "next_race_id": 1,
+        "next_race_at": 1,
+        "participantsCount": {"$size": {"$ifNull": ["$participants", []]}},
+    }
+
+    def __init__(self, _id, name, owner, public, status, participantsCount, max_players=20, next_race=None, position=None):
+        self._id = _id
+        self.name = name
+        self.owner = owner
+        self.public = public
+        self.status = status
+        self.participantsCount = participantsCount
+        self.max_players = max_players
+        self.next_race = next_race
+        self.position = position
+
+    def serialize(self):
+        return {
+            "_id": str(self._id) if self._id else None,
+            "name": self.name,
+            "owner": self.owner,
+            "public": self.public,
+            "status": self.status,
+            "participantsCount": self.participantsCount,
+            "max_players": self.max_players,
+            "next_race": self.next_race.serialize() if self.next_race else None,
+            "position": self.position
+        }
+
+    @staticmethod
+    def serialize_many(summaries):
+        return [summary.serialize() for summary in summaries]
+
+    @staticmethod
+    def find(match, email=None, limit=None, sort=None):
+        """
+        Load summaries of the leagues matching a filter
+
+        Args:
+            match: MongoDB filter on the leagues collection
+            email: When given, the caller's championship position is included
+            limit: Optional maximum number of documents to return
+            sort: Optional $sort specification applied before the limit
+        """
+        projection = dict(LeagueSummary.PROJECTION)
+        if email:
+            projection["standings.overall"] = 1
+            projection["tieBreakers"] = 1
+
+        pipeline = [{"$match": match}]
+        if sort:
+            pipeline.append({"$sort": sort})
+        if limit:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": projection})
+
+        return [LeagueSummary._from_document(doc, email) for doc in db.leagues.aggregate(pipeline)]
+
+    @staticmethod
+    def get_summaries_by_ids(league_ids):
+        """Load summaries for several leagues with one $in query, keyed by string id"""
+        object_ids = [ObjectId(league_id) for league_id in {str(league_id) for league_id in league_ids}
+                      if ObjectId.is_valid(league_id)]
+        if not object_ids:
+            return {}
+        summaries = LeagueSummary.find({"_id": {"$in": object_ids}})
+        return {str(summary._id): summary for summary in summaries}
+
+    @staticmethod
+    def get_leagues_page(match, cursor=None, limit=20):
+        """Cursor-paginated summaries, newest leagues first; see League.get_leagues_page"""
+        summaries = LeagueSummary.find(keyset_filter(match, cursor), sort={"_id": -1}, limit=limit + 1)
+        return split_page(summaries, limit)
+
+    @staticmethod
+    def get_leagues_by_user(email):
+        """Leagues the user owns or participates in, with the user's position"""
+        return LeagueSummary.find({
+            "$or": [
+                {"owner": email},
+                {"participants": {"$in": [email]}},  # Old format
+                {"participants.email": email}  # New format
+            ]
+        }, email=email)
+
+    @staticmethod
+    def get_leagues_racing_within(hours=24):
+        """Public leagues whose next race starts within the given number of hours, soonest first"""
+        match = {**League.racing_within_filter(hours), **League.PUBLIC_LEAGUES_FILTER}
+        return LeagueSummary.find(match, sort={"next_race_at": 1})
+
+    @staticmethod
+    def _from_document(league_data, email=None):
+        calendar = [Race.deserialize(race_data) for race_data in league_data.get('calendar') or []]
+
+        position = None
+        if email:
+            overall = league_data.get('standings', {}).get('overall')
+            if overall is not None:
+                position = League.get_position_in_standings(overall, email, league_data.get('tieBreakers'))
+
+        return LeagueSummary(
+            _id=league_data.get('_id'),
+            name=league_data.get('name'),
+            owner=league_data.get('owner'),
+            public=league_data.get('public', False),
+            status=league_data.get('status'),
+            participantsCount=league_data.get('participantsCount', 0),
+            max_players=league_data.get('max_players', 20),
+            next_race=League.resolve_next_race(
+                calendar,
+                league_data.get('next_race_id'),
+                League._as_utc(league_data.get('next_race_at'))
+            ),
+            position=position
+        )
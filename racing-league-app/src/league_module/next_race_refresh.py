@@ -0,0 +1,31 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+from src.config.config import Config
+from src.league_module.league import League
+
+scheduler = BackgroundScheduler()
+
+
+def refresh_next_races():
+    """Recompute the next race of leagues whose stored one has already started"""
+    try:
+        updated = League.refresh_stale_next_races()
+        if updated:
+            print(f"Refreshed the next race of {updated} leagues")
+    except Exception as e:
+        print(f"Next race refresh failed: {str(e)}")
+
+
+def start_next_race_refresh():
+    """
+    Refresh stale next races every NEXT_RACE_REFRESH_INTERVAL seconds in a background thread
+
+    Reads only use the stored next_race_at, so a league whose race passed
+    without results is missing from next race queries until this runs.
+    """
+    scheduler.add_job(func=refresh_next_races, trigger="interval", seconds=Config.NEXT_RACE_REFRESH_INTERVAL,
+                      max_instances=1, coalesce=True)
+    scheduler.start()
+
+
+import atexit
+atexit.register(lambda: scheduler.shutdown() if scheduler.running else None)
@@ -0,0 +1,59 @@
+import base64
+import json
+from bson.objectid import ObjectId
+from src.config.config import Config
+
+
+def encode_cursor(last_id):
+    """Build the opaque token pointing after the league with the given id"""
+    payload = json.dumps({"_id": str(last_id)}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a token produced by encode_cursor
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return ObjectId(payload["_id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(value):
+    """Clamp a requested page size to the configured bounds"""
+    try:
+        limit = int(value) if value is not None else Config.LEAGUE_PAGE_DEFAULT_SIZE
+    except (TypeError, ValueError):
+        raise ValueError("Invalid limit")
+    return max(1, min(limit, Config.LEAGUE_PAGE_MAX_SIZE))
+
+
+def keyset_filter(match, cursor=None):
+    """
+    Restrict a filter to the documents after the cursor
+
+    Pages are ordered by _id descending (newest first), so page N is served by
+    the same indexed range scan as page 1 instead of skipping N * limit documents.
+    """
+    if not cursor:
+        return match
+    return {"$and": [match, {"_id": {"$lt": decode_cursor(cursor)}}]}
+
+
+def split_page(items, limit):
+    """
+    Split limit + 1 fetched items into the page and the next cursor
+
+    Returns:
+        Tuple of (items on this page, next cursor or None on the last page)
+    """
+    if len(items) > limit:
+        items = items[:limit]
+        return items, encode_cursor(items[-1]._id)
+    return items, None
@@ -0,0 +1,316 @@
+"""
+Incremental maintenance of league standings.
+
+Overall standings are kept up to date by applying the change caused by a single
+race instead of re-summing the whole season. Driver keys are emails, which
+contain dots and therefore cannot be addressed with dotted update paths, so the
+MongoDB updates are expressed as aggregation pipeline stages using
+$getField/$setField (MongoDB 5.0+).
+"""
+
+STAT_FIELDS = ("points", "wins", "podiums", "dnfs", "fastestLaps")
+
+
+def empty_stats():
+    return {field: 0 for field in STAT_FIELDS}
+
+
+def race_contribution(result):
+    """Overall stats a single race result adds to a driver's standings"""
+    return {
+        "points": result.get("points", 0),
+        "wins": 1 if result.get("wins", 0) > 0 else 0,
+        "podiums": 1 if result.get("podiums", 0) > 0 else 0,
+        "dnfs": 1 if result.get("dnf", False) else 0,
+        "fastestLaps": 1 if result.get("fastest_lap", False) else 0
+    }
+
+
+def race_delta(previous_results, new_results):
+    """
+    Per-driver change of the overall standings when a race's results are replaced
+
+    Args:
+        previous_results: Results previously stored for the race, or None on first submission
+        new_results: Results being stored for the race
+
+    Returns:
+        Dict mapping drivers to {stat: change}; every driver of new_results is included
+    """
+    deltas = {}
+    for driver, result in (previous_results or {}).items():
+        contribution = race_contribution(result)
+        deltas[driver] = {field: -contribution[field] for field in STAT_FIELDS}
+
+    for driver, result in new_results.items():
+        contribution = race_contribution(result)
+        delta = deltas.setdefault(driver, empty_stats())
+        for field in STAT_FIELDS:
+            delta[field] += contribution[field]
+
+    # Drivers that only appear in the previous results and whose stats do not change
+    return {
+        driver: delta for driver, delta in deltas.items()
+        if driver in new_results or any(delta.values())
+    }
+
+
+def apply_delta(overall, deltas):
+    """Apply race deltas to an in-memory overall standings dict"""
+    for driver, delta in deltas.items():
+        stats = overall.setdefault(driver, empty_stats())
+        for field, change in delta.items():
+            stats[field] = stats.get(field, 0) + change
+    return overall
+
+
+def _get_field(field, source):
+    return {"$getField": {"field": {"$literal": field}, "input": source}}
+
+
+def set_field_stage(path, key, value):
+    """
+    Pipeline stage setting path.<key> to an expression, for keys that may contain dots
+
+    Args:
+        path: Dotted path of the embedded document, e.g. "standings.overall"
+        key: Field name inside that document; used verbatim
+        value: Aggregation expression for the new value
+    """
+    return {"$set": {path: {"$setField": {
+        "field": {"$literal": key},
+        "input": {"$ifNull": [f"${path}", {}]},
+        "value": value
+    }}}}
+
+
+def overall_delta_stages(deltas):
+    """
+    Pipeline stages incrementing standings.overall.<driver>.<stat> by the given deltas
+
+    Other fields of a driver's entry (e.g. name) are preserved and missing
+    entries are created.
+    """
+    stages = []
+    for driver, delta in deltas.items():
+        current = {"$ifNull": [_get_field(driver, "$standings.overall"), {}]}
+        increments = {
+            field: {"$add": [{"$ifNull": [_get_field(field, current), 0]}, change]}
+            for field, change in delta.items()
+        }
+        stages.append(set_field_stage("standings.overall", driver, {"$mergeObjects": [current, increments]}))
+    return stages
+
+
+# Stats compared after points when drivers are level, in order
+DEFAULT_TIE_BREAKERS = ("wins", "podiums")
+# Tie-breakers where the lower value ranks higher
+ASCENDING_STATS = ("dnfs",)
+
+
+def validate_tie_breakers(tie_breakers):
+    """
+    Check a league's tie-breaker list
+
+    Raises:
+        Exception: If a tie-breaker is not a standings stat
+    """
+    tie_breakers = list(tie_breakers)
+    for field in tie_breakers:
+        if field not in STAT_FIELDS or field == "points":
+            raise Exception(f"Invalid tie-breaker: {field}")
+    return tie_breakers
+
+
+def _ranking_key(stats, tie_breakers):
+    key = [stats.get("points", 0)]
+    for field in tie_breakers:
+        value = stats.get(field, 0)
+        key.append(-value if field in ASCENDING_STATS else value)
+    return tuple(key)
+
+
+def rank(overall, tie_breakers=None):
+    """
+    Championship positions using competition ranking ("1224")
+
+    Drivers are ordered by points, then by each tie-breaker; drivers still
+    level share a position and the next position is skipped.
+
+    Returns:
+        Dict mapping drivers to their position
+    """
+    tie_breakers = DEFAULT_TIE_BREAKERS if tie_breakers is None else tie_breakers
+    keys = {driver: _ranking_key(stats, tie_breakers) for driver, stats in overall.items()}
+    ordered = sorted(keys, key=keys.get, reverse=True)
+    positions = {}
+    for index, driver in enumerate(ordered):
+        if index and keys[driver] == keys[ordered[index - 1]]:
+            positions[driver] = positions[ordered[index - 1]]
+        else:
+            positions[driver] = index + 1
+    return positions
+
+
+def assign_positions(overall, tie_breakers=None):
+    """Store each driver's position on its overall standings entry"""
+    positions = rank(overall, tie_breakers)
+    for driver, position in positions.items():
+        overall[driver]["position"] = position
+    return positions
+
+
+def _ranking_expr(stats, tie_breakers):
+    """Aggregation counterpart of _ranking_key for a stats document expression"""
+    key = [{"$ifNull": [f"{stats}.points", 0]}]
+    for field in tie_breakers:
+        value = {"$ifNull": [f"{stats}.{field}", 0]}
+        key.append({"$multiply": [value, -1]} if field in ASCENDING_STATS else value)
+    return key
+
+
+def ranks_ahead_expr(left, right):
+    """Expression comparing two ranking keys (lists of expressions); true when left ranks ahead"""
+    ahead = {"$gt": [left[-1], right[-1]]}
+    for left_value, right_value in zip(reversed(left[:-1]), reversed(right[:-1])):
+        ahead = {"$or": [{"$gt": [left_value, right_value]},
+                         {"$and": [{"$eq": [left_value, right_value]}, ahead]}]}
+    return ahead
+
+
+def position_expr(entry, entries, tie_breakers=None):
+    """
+    Expression ranking one standings entry the way rank() does
+
+    Args:
+        entry: Expression of a {k, v} entry of $objectToArray over the overall standings
+        entries: Expression of the full $objectToArray array
+        tie_breakers: Stats compared after points
+
+    Returns:
+        1 plus the number of entries ranked strictly ahead, i.e. competition ranking
+    """
+    tie_breakers = DEFAULT_TIE_BREAKERS if tie_breakers is None else tie_breakers
+    return {"$add": [1, {"$size": {"$filter": {
+        "input": entries,
+        "as": "other",
+        "cond": ranks_ahead_expr(_ranking_expr("$$other.v", tie_breakers), _ranking_expr(f"{entry}.v", tie_breakers))
+    }}}]}
+
+
+def positions_stage(tie_breakers=None):
+    """
+    Pipeline stage ranking standings.overall and storing each driver's position
+
+    The ranking is computed by the server from the standings as they are when
+    the update runs, after the race's increments, so concurrent submissions
+    cannot store positions ranked from an outdated copy.
+    """
+    return {"$set": {"standings.overall": {"$let": {
+        "vars": {"entries": {"$objectToArray": {"$ifNull": ["$standings.overall", {}]}}},
+        "in": {"$arrayToObject": {"$map": {
+            "input": "$$entries",
+            "as": "entry",
+            "in": {"k": "$$entry.k", "v": {"$mergeObjects": [
+                "$$entry.v", {"position": position_expr("$$entry", "$$entries", tie_breakers)}
+            ]}}
+        }}}
+    }}}}
+
+
+# Team totals stored on teamStandings for each driver stat
+TEAM_TOTAL_FIELDS = {
+    "points": "total_points",
+    "wins": "total_wins",
+    "podiums": "total_podiums",
+    "dnfs": "total_dnfs",
+    "fastestLaps": "total_fastest_laps"
+}
+# Team leaderboard order, level teams keep their stored order
+TEAM_RANKING_FIELDS = ("total_points", "total_wins", "total_podiums")
+
+
+def team_position_expr(entry, entries):
+    """
+    Expression ranking one teamStandings entry the way League.compute_team_standings does
+
+    Args:
+        entry: Expression of a {k, v} entry of $objectToArray over teamStandings
+        entries: Expression of the full $objectToArray array
+
+    Returns:
+        1 plus the number of teams ahead, counting level teams stored before this one
+    """
+    def key(team):
+        return [{"$ifNull": [f"{team}.v.{field}", 0]} for field in TEAM_RANKING_FIELDS]
+
+    index = {"$indexOfArray": [f"{entries}.k", f"{entry}.k"]}
+    return {"$add": [1, {"$size": {"$filter": {
+        "input": entries,
+        "as": "other",
+        "cond": {"$or": [
+            ranks_ahead_expr(key("$$other"), key(entry)),
+            {"$and": [
+                {"$eq": [key("$$other"), key(entry)]},
+                {"$lt": [{"$indexOfArray": [f"{entries}.k", "$$other.k"]}, index]}
+            ]}
+        ]}
+    }}}]}
+
+
+def team_standings_stages(names):
+    """
+    Pipeline stages recomputing teamStandings from the stored teams and overall standings
+
+    Mirrors League.compute_team_standings on the server, after the race
+    increments, so concurrent submissions cannot store totals summed from an
+    outdated copy of the standings.
+
+    Args:
+        names: Dict mapping member emails to display names; missing members show their email
+    """
+    emails = list(names)
+    # $getField needs a constant field name, so members are looked up in the entries array
+    stats = {"$ifNull": [{"$arrayElemAt": [{"$map": {
+        "input": {"$filter": {"input": "$$overall", "as": "driver", "cond": {"$eq": ["$$driver.k", "$$email"]}}},
+        "as": "driver",
+        "in": "$$driver.v"
+    }}, 0]}, {}]}
+    member = {"$let": {
+        "vars": {"stats": stats, "index": {"$indexOfArray": [{"$literal": emails}, "$$email"]}},
+        "in": {
+            "email": "$$email",
+            "name": {"$cond": [
+                {"$gte": ["$$index", 0]},
+                {"$arrayElemAt": [{"$literal": [names[email] for email in emails]}, "$$index"]},
+                "$$email"
+            ]},
+            **{field: {"$ifNull": [f"$$stats.{field}", 0]} for field in STAT_FIELDS}
+        }
+    }}
+    totals = {"$set": {"teamStandings": {"$let": {
+        "vars": {"overall": {"$objectToArray": {"$ifNull": ["$standings.overall", {}]}}},
+        "in": {"$arrayToObject": {"$map": {
+            "input": {"$objectToArray": {"$ifNull": ["$teams", {}]}},
+            "as": "team",
+            "in": {"k": "$$team.k", "v": {"$let": {
+                "vars": {"details": {"$map": {"input": "$$team.v", "as": "email", "in": member}}},
+                "in": {
+                    "members": "$$team.v",
+                    **{total: {"$sum": f"$$details.{field}"} for field, total in TEAM_TOTAL_FIELDS.items()},
+                    "member_details": "$$details"
+                }
+            }}}
+        }}}
+    }}}}
+    positions = {"$set": {"teamStandings": {"$let": {
+        "vars": {"entries": {"$objectToArray": "$teamStandings"}},
+        "in": {"$arrayToObject": {"$map": {
+            "input": "$$entries",
+            "as": "entry",
+            "in": {"k": "$$entry.k", "v": {"$mergeObjects": [
+                "$$entry.v", {"position": team_position_expr("$$entry", "$$entries")}
+            ]}}
+        }}}
+    }}}}
+    return [totals, positions]
@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from pymongo import ReplaceOne
+from src.config.mongo import db
+from src.league_module import standings as standings_engine
+
+
+class StandingsSnapshot:
+    """
+    Cumulative overall standings after each race, stored in the
+    standings_snapshots collection keyed by (league, race_order).
+
+    race_order is the 1-based position of the race in the league calendar.
+    Only races with results have a snapshot; the standings "after race N" are
+    those of the latest snapshot whose race_order is at most N.
+    """
+
+    @staticmethod
+    def build(league, from_race_id=None):
+        """
+        Compute the snapshots of a league from its stored race results
+
+        Args:
+            league: League whose standings["races"] holds the results
+            from_race_id: Only return snapshots from this race on; earlier ones are unaffected by it
+
+        Returns:
+            List of snapshot documents in calendar order
+        """
+        races = league.standings.get("races", {})
+        cumulative = {}
+        snapshots = []
+        include = from_race_id is None
+        for index, race in enumerate(league.calendar):
+            race_id = str(race._id)
+            include = include or race_id == str(from_race_id)
+            if race_id not in races:
+                continue
+            for driver, result in races[race_id].items():
+                contribution = standings_engine.race_contribution(result)
+                stats = cumulative.setdefault(driver, standings_engine.empty_stats())
+                for field in standings_engine.STAT_FIELDS:
+                    stats[field] += contribution[field]
+            if include:
+                standings = {driver: dict(stats) for driver, stats in cumulative.items()}
+                standings_engine.assign_positions(standings, league.tieBreakers)
+                snapshots.append({
+                    "league": str(league._id),
+                    "race_order": index + 1,
+                    "race_id": race_id,
+                    "track": race.track,
+                    "standings": standings
+                })
+        return snapshots
+
+    @staticmethod
+    def record(league, race_id):
+        """
+        Store the snapshot after race_id and rewrite the later ones it changes
+
+        A first submission of the latest race writes a single document; resubmitting
+        an earlier race also replaces every later snapshot with one bulk write.
+        """
+        snapshots = StandingsSnapshot.build(league, from_race_id=race_id)
+        if not snapshots:
+            return
+        now = datetime.now(timezone.utc)
+        db.standings_snapshots.bulk_write([
+            ReplaceOne(
+                {"league": snapshot["league"], "race_order": snapshot["race_order"]},
+                {**snapshot, "updated_at": now},
+                upsert=True
+            )
+            for snapshot in snapshots
+        ], ordered=False)
+
+    @staticmethod
+    def rebuild(league):
+        """Replace every snapshot of a league, e.g. after its calendar was reordered"""
+        db.standings_snapshots.delete_many({"league": str(league._id)})
+        snapshots = StandingsSnapshot.build(league)
+        if snapshots:
+            now = datetime.now(timezone.utc)
+            db.standings_snapshots.insert_many([{**snapshot, "updated_at": now} for snapshot in snapshots])
+        return len(snapshots)
+
+    @staticmethod
+    def serialize(snapshot):
+        return {
+            "race_order": snapshot["race_order"],
+            "race_id": snapshot["race_id"],
+            "track": snapshot.get("track"),
+            "standings": snapshot["standings"]
+        }
+
+    @staticmethod
+    def get_progression(league_id):
+        """Every snapshot of a league in calendar order"""
+        snapshots = db.standings_snapshots.find({"league": str(league_id)}, {"_id": 0}).sort("race_order", 1)
+        return [StandingsSnapshot.serialize(snapshot) for snapshot in snapshots]
+
+    @staticmethod
+    def get_after_race(league_id, race_order):
+        """Standings after the race at race_order (1-based), or None before the first result"""
+        snapshot = db.standings_snapshots.find_one(
+            {"league": str(league_id), "race_order": {"$lte": race_order}},
+            {"_id": 0},
+            sort=[("race_order", -1)]
+        )
+        return StandingsSnapshot.serialize(snapshot) if snapshot else None
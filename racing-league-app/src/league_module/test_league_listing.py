@@ -0,0 +1,42 @@
+from flask import Flask
+
+from src.config.config import Config
+from src.league_module.league import League
+from src.league_module.league_controller import league_blueprint
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(league_blueprint)
+    return app.test_client()
+
+
+def _add_leagues(count, public=True):
+    for index in range(count):
+        League(name=f"League {index}", owner="a@example.com", public=public, calendar=[],
+               pointSystem={}, status="Active").save()
+
+
+def test_public_listing_is_paginated_by_default(mongo_db, monkeypatch):
+    monkeypatch.setattr(Config, 'LEAGUE_PAGE_DEFAULT_SIZE', 2)
+    _add_leagues(3)
+    _add_leagues(1, public=False)
+    client = _client()
+
+    first = client.get('/api/v1/leagues/public').get_json()
+    second = client.get('/api/v1/leagues/public', query_string={'cursor': first['next_cursor']}).get_json()
+
+    assert [league['name'] for league in first['leagues']] == ["League 2", "League 1"]
+    assert [league['name'] for league in second['leagues']] == ["League 0"]
+    assert second['next_cursor'] is None
+
+
+def test_requested_page_size_is_capped(mongo_db, monkeypatch):
+    monkeypatch.setattr(Config, 'LEAGUE_PAGE_MAX_SIZE', 2)
+    _add_leagues(3)
+
+    page = _client().get('/api/v1/leagues/all', query_string={'limit': 1000}).get_json()
+
+    assert page['limit'] == 2
+    assert len(page['leagues']) == 2
+    assert page['next_cursor'] is not None
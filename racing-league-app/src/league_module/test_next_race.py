@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+
+from src.league_module.league import League
+from src.league_module.next_race_refresh import refresh_next_races
+from src.league_module.race import Race
+
+
+def _league(*races):
+    return League(name="League", owner="owner@example.com", public=True, calendar=list(races),
+                  pointSystem={}, status="Active", participants=[{"email": "driver@example.com"}])
+
+
+def test_unchanged_next_race_is_not_rewritten(mongo_db):
+    # Microseconds do not survive the round trip through MongoDB
+    date = datetime.now(timezone.utc).replace(microsecond=123456) + timedelta(days=1)
+    league = _league(Race(track="Monza", date=date, _id="r1"))
+    league.save()
+
+    league = League.get_league_by_id(str(league._id))
+    league.refresh_next_race()
+
+    assert league.next_race_at.microsecond == 123000
+    assert "next_race_at" not in league._dirty
+
+
+def test_reads_do_not_refresh_stale_next_races(mongo_db):
+    now = datetime.now(timezone.utc)
+    league = _league(Race(track="Monza", date=now - timedelta(hours=1), _id="r1"),
+                     Race(track="Spa", date=now + timedelta(hours=2), _id="r2"))
+    league.save()
+    mongo_db.leagues.update_one({"_id": league._id}, {"$set": {"next_race_id": "r1", "next_race_at": now - timedelta(hours=1)}})
+
+    assert League.get_next_race_for_participant("driver@example.com") is None
+    assert mongo_db.leagues.count_documents(League.racing_within_filter(24)) == 0
+    assert mongo_db.leagues.find_one({"_id": league._id})["next_race_id"] == "r1"
+
+    assert League.refresh_stale_next_races() == 1
+    assert League.get_next_race_for_participant("driver@example.com").next_race._id == "r2"
+    assert mongo_db.leagues.count_documents(League.racing_within_filter(24)) == 1
+
+
+def test_scheduled_refresh_restores_leagues_whose_race_passed(mongo_db):
+    now = datetime.now(timezone.utc)
+    league = _league(Race(track="Monza", date=now - timedelta(hours=1), _id="r1"),
+                     Race(track="Spa", date=now + timedelta(hours=2), _id="r2"))
+    league.save()
+    mongo_db.leagues.update_one({"_id": league._id}, {"$set": {"next_race_id": "r1", "next_race_at": now - timedelta(hours=1)}})
+
+    refresh_next_races()
+
+    assert mongo_db.leagues.find_one({"_id": league._id})["next_race_id"] == "r2"
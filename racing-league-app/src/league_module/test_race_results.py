@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+from src.league_module import standings
+from src.league_module.league import League
+from src.league_module.race import Race
+from src.league_module.standings_snapshot import StandingsSnapshot
+
+# The result update is an aggregation pipeline using $setField/$getField, which
+# mongomock cannot run; these tests need MONGO_TEST_URI (see conftest.mongo_server)
+
+DRIVERS = ["a.one@example.com", "b@example.com", "c@example.com"]
+
+
+def _results(*order, dnf=()):
+    results = {}
+    for index, driver in enumerate(order):
+        position = index + 1
+        results[driver] = {"position": position, "fastest_lap": position == 1, "dnf": driver in dnf,
+                           "wins": 1 if position == 1 else 0, "podiums": 1 if position <= 3 else 0}
+    return results
+
+
+def _league(mongo_server, teams=None):
+    for driver in DRIVERS:
+        mongo_server.users.insert_one({
+            "_id": driver, "name": driver.split("@")[0].upper(), "email": driver, "eaUsername": None,
+            "leagues": [], "races": [], "created_at": None, "updated_at": None, "deleted_at": None
+        })
+    now = datetime.now(timezone.utc)
+    league = League(name="League", owner=DRIVERS[0], public=True, status="Active",
+                    calendar=[Race(track="Monza", date=now + timedelta(days=1), _id="r1"),
+                              Race(track="Spa", date=now + timedelta(days=8), _id="r2")],
+                    pointSystem={"1": 25, "2": 18, "3": 15}, fastestLapPoint=1,
+                    participants=[{"email": driver} for driver in DRIVERS],
+                    teams=teams if teams is not None else {"Red": DRIVERS[:2], "Blue": DRIVERS[2:]})
+    league.save()
+    return league
+
+
+def _stored(league):
+    return League.get_league_by_id(str(league._id))
+
+
+def test_submission_updates_the_stored_league(mongo_server):
+    league = _league(mongo_server)
+
+    league.add_race_result("r1", _results(*DRIVERS))
+
+    stored = _stored(league)
+    assert stored.standings == league.standings
+    assert {driver: stats["position"] for driver, stats in stored.standings["overall"].items()} == \
+        {"a.one@example.com": 1, "b@example.com": 2, "c@example.com": 3}
+    assert stored.standings["overall"]["a.one@example.com"]["points"] == 26
+    assert stored.teamStandings == league.teamStandings
+    assert stored.teamStandings["Red"]["total_points"] == 44
+    assert [race.status for race in stored.calendar] == ["Completed", "Upcoming"]
+    assert stored.next_race_id == "r2"
+
+
+def test_resubmission_replaces_the_previous_results(mongo_server):
+    league = _league(mongo_server)
+    league.add_race_result("r1", _results(*DRIVERS))
+
+    _stored(league).add_race_result("r1", _results("c@example.com", "b@example.com", "a.one@example.com",
+                                                   dnf=("a.one@example.com",)))
+
+    stored = _stored(league)
+    expected = {driver: {key: stats[key] for key in standings.STAT_FIELDS + ("position",)}
+                for driver, stats in _stored(league).calculate_overall_standings().items()}
+    assert {driver: {key: stats[key] for key in standings.STAT_FIELDS + ("position",)}
+            for driver, stats in stored.standings["overall"].items()} == expected
+    assert stored.standings["overall"]["a.one@example.com"]["points"] == 0
+    assert stored.teamStandings["Blue"]["position"] == 1
+
+
+def test_stale_resubmission_is_not_counted_twice(mongo_server):
+    league = _league(mongo_server)
+    first, second = _stored(league), _stored(league)
+
+    first.add_race_result("r1", _results(*DRIVERS))
+    # Loaded before the first submission; its delta would add the race a second time
+    second.add_race_result("r1", _results(*DRIVERS))
+
+    stored = _stored(league)
+    assert stored.standings["overall"]["a.one@example.com"]["points"] == 26
+    assert stored.standings["overall"]["a.one@example.com"]["wins"] == 1
+    assert stored.teamStandings["Red"]["total_points"] == 44
+    assert second.standings == stored.standings
+
+
+def test_stored_positions_share_tied_places(mongo_server):
+    league = _league(mongo_server)
+    league.add_race_result("r1", _results(*DRIVERS))
+
+    league.add_race_result("r2", _results("b@example.com", "a.one@example.com", "c@example.com"))
+
+    overall = _stored(league).standings["overall"]
+    # a and b are level on points, wins and podiums
+    assert {driver: stats["position"] for driver, stats in overall.items()} == \
+        {"a.one@example.com": 1, "b@example.com": 1, "c@example.com": 3}
+    assert {driver: stats["position"] for driver, stats in overall.items()} == standings.rank(overall)
+
+
+def test_level_teams_keep_their_stored_order(mongo_server):
+    league = _league(mongo_server, teams={"Blue": ["c@example.com"], "Red": ["a.one@example.com"]})
+    retired = {"position": 0, "fastest_lap": False, "dnf": True, "wins": 0, "podiums": 0}
+
+    league.add_race_result("r1", {"a.one@example.com": retired, "c@example.com": retired})
+
+    stored = _stored(league)
+    assert stored.teamStandings == league.teamStandings
+    assert [stored.teamStandings[team]["position"] for team in ("Blue", "Red")] == [1, 2]
+
+
+def test_submissions_record_standings_snapshots(mongo_server):
+    league = _league(mongo_server)
+    league.add_race_result("r1", _results(*DRIVERS))
+
+    _stored(league).add_race_result("r2", _results("c@example.com", "b@example.com", "a.one@example.com"))
+
+    progression = StandingsSnapshot.get_progression(league._id)
+    assert [(snapshot["race_order"], snapshot["race_id"]) for snapshot in progression] == [(1, "r1"), (2, "r2")]
+    assert progression[0]["standings"]["a.one@example.com"]["points"] == 26
+    assert {driver: stats["points"] for driver, stats in progression[1]["standings"].items()} == \
+        {driver: stats["points"] for driver, stats in _stored(league).standings["overall"].items()}
+
@@ -0,0 +1,120 @@
+from src.league_module import standings
+from src.league_module.league import League
+
+
+def _result(position, points, dnf=False, fastest_lap=False):
+    return {"position": position, "points": points, "dnf": dnf, "fastest_lap": fastest_lap,
+            "wins": 1 if position == 1 else 0, "podiums": 1 if position <= 3 else 0}
+
+
+def test_race_delta_first_submission_adds_the_race():
+    deltas = standings.race_delta(None, {"a@example.com": _result(1, 25, fastest_lap=True)})
+
+    assert deltas == {"a@example.com": {"points": 25, "wins": 1, "podiums": 1, "dnfs": 0, "fastestLaps": 1}}
+
+
+def test_race_delta_resubmission_replaces_the_previous_results():
+    previous = {"a@example.com": _result(1, 25), "b@example.com": _result(2, 18), "c@example.com": _result(3, 15)}
+    # a and b swap, c drops out of the results, d is added
+    new = {"a@example.com": _result(2, 18), "b@example.com": _result(1, 25), "d@example.com": _result(4, 0, dnf=True)}
+    overall = standings.apply_delta({}, standings.race_delta(None, previous))
+
+    standings.apply_delta(overall, standings.race_delta(previous, new))
+
+    assert overall == standings.apply_delta({}, standings.race_delta(None, new)) | {"c@example.com": standings.empty_stats()}
+
+
+def test_race_delta_skips_unchanged_drivers_missing_from_the_new_results():
+    previous = {"a@example.com": _result(1, 25), "b@example.com": _result(10, 0)}
+
+    deltas = standings.race_delta(previous, {"a@example.com": _result(1, 25)})
+
+    assert deltas == {"a@example.com": standings.empty_stats()}
+
+
+def test_rank_uses_competition_ranking_for_ties():
+    overall = {
+        "a@example.com": {"points": 50, "wins": 2, "podiums": 2},
+        "b@example.com": {"points": 40, "wins": 1, "podiums": 2},
+        "c@example.com": {"points": 40, "wins": 1, "podiums": 2},
+        "d@example.com": {"points": 10, "wins": 0, "podiums": 0},
+    }
+
+    assert standings.rank(overall) == {"a@example.com": 1, "b@example.com": 2, "c@example.com": 2, "d@example.com": 4}
+
+
+def test_rank_applies_tie_breakers_in_order():
+    overall = {
+        "a@example.com": {"points": 40, "wins": 1, "podiums": 3, "dnfs": 2},
+        "b@example.com": {"points": 40, "wins": 2, "podiums": 2, "dnfs": 0},
+        "c@example.com": {"points": 40, "wins": 1, "podiums": 3, "dnfs": 1},
+    }
+
+    assert standings.rank(overall) == {"b@example.com": 1, "a@example.com": 2, "c@example.com": 2}
+    # Fewer DNFs rank higher
+    assert standings.rank(overall, ["podiums", "dnfs"]) == {"c@example.com": 1, "a@example.com": 2, "b@example.com": 3}
+
+
+def _server_positions(mongo_db, overall, tie_breakers=None):
+    # mongomock cannot run the whole stage ($mergeObjects), so evaluate the ranking expression it stores
+    mongo_db.leagues.insert_one({"standings": {"overall": overall}})
+    document = next(mongo_db.leagues.aggregate([{"$project": {"positions": {"$let": {
+        "vars": {"entries": {"$objectToArray": "$standings.overall"}},
+        "in": {"$map": {"input": "$$entries", "as": "entry", "in": {
+            "k": "$$entry.k", "v": standings.position_expr("$$entry", "$$entries", tie_breakers)
+        }}}
+    }}}}]))
+    return {entry["k"]: entry["v"] for entry in document["positions"]}
+
+
+def test_positions_stage_ranks_like_rank(mongo_db):
+    overall = {
+        "a.driver@example.com": {"name": "A", "points": 40, "wins": 1, "podiums": 3, "dnfs": 2},
+        "b@example.com": {"name": "B", "points": 40, "wins": 2, "podiums": 2, "dnfs": 0},
+        "c@example.com": {"name": "C", "points": 40, "wins": 1, "podiums": 3, "dnfs": 1},
+        "d@example.com": {"name": "D", "points": 51, "wins": 0, "podiums": 0, "dnfs": 0},
+        "e@example.com": {"name": "E"},
+    }
+
+    assert _server_positions(mongo_db, overall) == standings.rank(overall)
+    mongo_db.leagues.delete_many({})
+    assert _server_positions(mongo_db, overall, ["podiums", "dnfs"]) == standings.rank(overall, ["podiums", "dnfs"])
+
+
+def test_calculate_overall_standings_repairs_team_standings(mongo_db):
+    league = League(name="League", owner="a@example.com", public=True, calendar=[], pointSystem={}, status="Active",
+                    participants=[{"email": "a@example.com"}, {"email": "b@example.com"}],
+                    teams={"Red": ["a@example.com", "b@example.com"]},
+                    standings={"overall": {}, "races": {"r1": {"a@example.com": _result(1, 25),
+                                                                 "b@example.com": _result(2, 18)}}},
+                    teamStandings={"Red": {"members": ["a@example.com", "b@example.com"], "total_points": 0,
+                                           "member_details": [{"email": "a@example.com", "name": "A"},
+                                                              {"email": "b@example.com", "name": "B"}]}})
+    league._dirty.clear()
+
+    league.calculate_overall_standings()
+
+    assert league.teamStandings["Red"]["total_points"] == 43
+    assert league.teamStandings["Red"]["total_wins"] == 1
+    assert [member["name"] for member in league.teamStandings["Red"]["member_details"]] == ["A", "B"]
+    assert {"standings.overall", "teamStandings"} <= league._dirty
+
+
+def test_renamed_members_show_their_current_name(mongo_db):
+    mongo_db.users.insert_one({
+        "_id": "a", "name": "Renamed", "email": "a@example.com", "eaUsername": None,
+        "leagues": [], "races": [], "created_at": None, "updated_at": None, "deleted_at": None
+    })
+    league = League(name="League", owner="a@example.com", public=True, calendar=[], pointSystem={}, status="Active",
+                    participants=[{"email": "a@example.com"}], teams={"Red": ["a@example.com"]},
+                    standings={"overall": {"a@example.com": {"name": "Original", "points": 25}}},
+                    teamStandings={"Red": {"members": ["a@example.com"], "total_points": 25, "position": 1,
+                                           "member_details": [{"email": "a@example.com", "name": "Original"}]}})
+
+    serialized = league.serialize()
+
+    assert serialized["standings"]["overall"]["a@example.com"] == {"name": "Renamed", "points": 25}
+    assert serialized["teams"]["Red"]["member_details"] == [{"email": "a@example.com", "name": "Renamed"}]
+    assert league.get_team_standings()[0]["member_details"][0]["name"] == "Renamed"
+    # The stored documents are left as they were
+    assert league.standings["overall"]["a@example.com"]["name"] == "Original"
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from src.league_module.league import League
+from src.league_module.league_service import LeagueService
+from src.league_module.race import Race
+from src.league_module.standings_snapshot import StandingsSnapshot
+
+
+def _result(position, points):
+    return {"position": position, "points": points, "dnf": False, "fastest_lap": False,
+            "wins": 1 if position == 1 else 0, "podiums": 1 if position <= 3 else 0}
+
+
+def _league():
+    now = datetime.now(timezone.utc)
+    calendar = [Race(track=track, date=now + timedelta(days=index), _id=f"r{index + 1}")
+                for index, track in enumerate(["Monza", "Spa", "Imola"])]
+    return League(name="League", owner="a@example.com", public=True, calendar=calendar,
+                  pointSystem={}, status="Active", _id=ObjectId())
+
+
+def _submit(league, race_id, results):
+    # add_race_result stores the results, then records the snapshots
+    league.standings["races"][race_id] = results
+    StandingsSnapshot.record(league, race_id)
+
+
+def _points(snapshot):
+    return {driver: (stats["points"], stats["position"]) for driver, stats in snapshot["standings"].items()}
+
+
+def test_snapshots_are_cumulative(mongo_db):
+    league = _league()
+    _submit(league, "r1", {"a@example.com": _result(1, 25), "b@example.com": _result(2, 18)})
+    _submit(league, "r2", {"a@example.com": _result(2, 18), "b@example.com": _result(1, 25)})
+
+    progression = StandingsSnapshot.get_progression(league._id)
+
+    assert [snapshot["race_order"] for snapshot in progression] == [1, 2]
+    assert _points(progression[0]) == {"a@example.com": (25, 1), "b@example.com": (18, 2)}
+    assert _points(progression[1]) == {"a@example.com": (43, 1), "b@example.com": (43, 1)}
+
+
+def test_resubmitting_an_earlier_race_rewrites_later_snapshots(mongo_db):
+    league = _league()
+    _submit(league, "r1", {"a@example.com": _result(1, 25), "b@example.com": _result(2, 18)})
+    _submit(league, "r2", {"a@example.com": _result(1, 25), "b@example.com": _result(2, 18)})
+
+    _submit(league, "r1", {"a@example.com": _result(2, 18), "b@example.com": _result(1, 25)})
+
+    progression = StandingsSnapshot.get_progression(league._id)
+    assert len(progression) == 2
+    assert _points(progression[0]) == {"b@example.com": (25, 1), "a@example.com": (18, 2)}
+    assert _points(progression[1]) == {"a@example.com": (43, 1), "b@example.com": (43, 1)}
+    assert mongo_db.standings_snapshots.count_documents({"league": str(league._id)}) == 2
+
+
+def test_standings_after_a_race_without_results_are_the_previous_ones(mongo_db):
+    league = _league()
+    _submit(league, "r1", {"a@example.com": _result(1, 25)})
+    _submit(league, "r3", {"a@example.com": _result(1, 25)})
+
+    assert StandingsSnapshot.get_after_race(league._id, 2)["race_id"] == "r1"
+    assert StandingsSnapshot.get_after_race(league._id, 3)["race_id"] == "r3"
+    assert StandingsSnapshot.get_after_race(league._id, 0) is None
+
+
+def test_rebuild_follows_the_calendar_order(mongo_db):
+    league = _league()
+    _submit(league, "r1", {"a@example.com": _result(1, 25)})
+    _submit(league, "r2", {"b@example.com": _result(1, 25)})
+
+    league.calendar.reverse()
+
+    assert StandingsSnapshot.rebuild(league) == 2
+    progression = StandingsSnapshot.get_progression(league._id)
+    assert [snapshot["race_id"] for snapshot in progression] == ["r2", "r1"]
+    assert [snapshot["race_order"] for snapshot in progression] == [2, 3]
+
+
+def test_calendar_edit_rebuilds_the_snapshots(mongo_db):
+    league = _league()
+    _submit(league, "r1", {"a@example.com": _result(1, 25)})
+    _submit(league, "r2", {"b@example.com": _result(1, 25)})
+    calendar = [race.serialize() for race in league.calendar]
+
+    LeagueService.update_league(league, {"name": league.name, "public": league.public, "pointSystem": {},
+                                         "calendar": [calendar[2], calendar[1], calendar[0]]})
+
+    progression = StandingsSnapshot.get_progression(league._id)
+    assert [snapshot["race_id"] for snapshot in progression] == ["r2", "r1"]
+    assert [snapshot["race_order"] for snapshot in progression] == [2, 3]
@@ -1,7 +1,13 @@
 # project/src/models/user.py
 from bson.objectid import ObjectId
 from src.config.mongo import db
+from src.config.config import Config
+from src.cache_module.ttl_cache import TTLCache
 from datetime import datetime, timezone
+import copy
+
+# Process-wide cache of raw user documents, keyed by "email:<email>" and "id:<id>"
+user_cache = TTLCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
 
 class User:
     def __init__(self, _id, name, email, eaUsername, leagues=[], races=[], created_at=None, updated_at=None, deleted_at=None):
@@ -24,38 +30,86 @@ class User:
             "leagues": self.leagues
         }
 
+    @staticmethod
+    def _from_document(user_data):
+        return User(
+            _id=user_data['_id'],
+            name=user_data['name'],
+            email=user_data['email'],
+            eaUsername=user_data['eaUsername'],
+            leagues=user_data['leagues'],
+            races=user_data['races'],
+            created_at=user_data['created_at'],
+            updated_at=user_data['updated_at'],
+            deleted_at=user_data['deleted_at']
+        )
+
+    @staticmethod
+    def _cache_document(user_data):
+        user_cache.set(f"email:{user_data['email']}", user_data)
+        user_cache.set(f"id:{user_data['_id']}", user_data)
+
+    @staticmethod
+    def _cached_document(key):
+        user_data = user_cache.get(key)
+        # Hand out copies so callers mutating a User never alter the cached document
+        return copy.deepcopy(user_data) if user_data is not None else None
+
+    @staticmethod
+    def invalidate_cache(_id=None, email=None):
+        """Drop cached documents for a user, by id and/or email"""
+        if _id is not None:
+            cached = user_cache.pop(f"id:{_id}")
+            if cached:
+                user_cache.pop(f"email:{cached['email']}")
+        if email is not None:
+            cached = user_cache.pop(f"email:{email}")
+            if cached:
+                user_cache.pop(f"id:{cached['_id']}")
+
+    @staticmethod
+    def cache_stats():
+        return user_cache.stats()
+
     @staticmethod
     def get_user_by_mail(email):
-        user_data = db.users.find_one({"email": email})
+        user_data = User._cached_document(f"email:{email}")
+        if user_data is None:
+            user_data = db.users.find_one({"email": email})
+            if user_data:
+                User._cache_document(user_data)
+                user_data = copy.deepcopy(user_data)
         if user_data:
-            return User(
-                _id=user_data['_id'],
-                name=user_data['name'],
-                email=user_data['email'],
-                eaUsername=user_data['eaUsername'],
-                leagues=user_data['leagues'],
-                races=user_data['races'],
-                created_at=user_data['created_at'],
-                updated_at=user_data['updated_at'],
-                deleted_at=user_data['deleted_at']
-            )
+            return User._from_document(user_data)
         return None
+
+    @staticmethod
+    def get_users_by_mails(emails):
+        """Fetch several users with a single $in query, keyed by email"""
+        users = {}
+        missing = []
+        for email in {email for email in emails if email}:
+            user_data = User._cached_document(f"email:{email}")
+            if user_data is None:
+                missing.append(email)
+            else:
+                users[email] = User._from_document(user_data)
+        if missing:
+            for user_data in db.users.find({"email": {"$in": missing}}):
+                User._cache_document(user_data)
+                users[user_data['email']] = User._from_document(copy.deepcopy(user_data))
+        return users
     
     @staticmethod
     def get_user_by_id(user_id):
-        user_data = db.users.find_one({"_id": ObjectId(user_id)})
+        user_data = User._cached_document(f"id:{user_id}")
+        if user_data is None:
+            user_data = db.users.find_one({"_id": ObjectId(user_id)})
+            if user_data:
+                User._cache_document(user_data)
+                user_data = copy.deepcopy(user_data)
         if user_data:
-            return User(
-                _id=user_data['_id'],
-                name=user_data['name'],
-                email=user_data['email'],
-                eaUsername=user_data['eaUsername'],
-                leagues=user_data['leagues'],
-                races=user_data['races'],
-                created_at=user_data['created_at'],
-                updated_at=user_data['updated_at'],
-                deleted_at=user_data['deleted_at']
-            )
+            return User._from_document(user_data)
         return None
 
     def save(self):
@@ -72,6 +126,7 @@ class User:
         }
         result = db.users.insert_one(user)
         self._id = result.inserted_id
+        User.invalidate_cache(_id=self._id, email=self.email)
 
     def update(self):
         """Update the user in MongoDB"""
@@ -79,13 +134,17 @@ class User:
             {"_id": self._id},
             {"$set": {"name": self.name, "email": self.email, "eaUsername": self.eaUsername}}
         )
+        # The id entry still points at the previous email, so it is dropped first
+        User.invalidate_cache(_id=self._id, email=self.email)
 
     @staticmethod
     def delete_user(user_id):
-        db.users.update_one(
+        user_data = db.users.find_one_and_update(
             {"_id": ObjectId(user_id)},
-            {"$set": {"deleted_at": datetime.now(timezone.utc)}}
+            {"$set": {"deleted_at": datetime.now(timezone.utc)}},
+            projection={"email": 1}
         )
+        User.invalidate_cache(_id=ObjectId(user_id), email=user_data['email'] if user_data else None)
 
     def to_dict(self):
         """Convert the user object to a dictionary"""
@@ -1,21 +1,34 @@
 # project/src/auth_module/auth_controller.py
 from flask import Blueprint, request, jsonify
 from src.auth_module.auth_service import AuthService, login_required
-from firebase_admin import auth
 from src.user_module.user import User
+from src.user_module.user_loader import UserLoader
 from src.league_module.league_service import LeagueService
+from src.user_module.user_service import UserService
 
 user_blueprint = Blueprint('user', __name__, url_prefix='/api/v1/users')
 
 @user_blueprint.route('/profile', methods=['GET'])
 @login_required
 def user_info():
-    current_user = auth.get_user(AuthService.get_current_user())
-    user = User.get_user_by_mail(current_user.email)
+    current_user = AuthService.get_current_principal()
+    user = UserLoader.current().load(current_user.email)
     if (user is None):
         return jsonify({"message": "User not found"}), 404
     return jsonify(user.serialize()), 200
 
+@user_blueprint.route('/next-race', methods=['GET'])
+@login_required
+def next_race():
+    current_user = AuthService.get_current_principal()
+    league, race = UserService.get_next_race_of_user(current_user.email)
+    if race is None:
+        return jsonify({"message": "No upcoming race"}), 404
+    return jsonify({
+        "league": {"_id": str(league._id), "name": league.name},
+        "race": race.serialize()
+    }), 200
+
 @user_blueprint.route('/update', methods=['PUT'])
 @login_required
 def update_user():
@@ -31,8 +44,8 @@ def update_user():
 @login_required
 def update_password():
     data = request.json
-    user_id = AuthService.get_current_user()
-    user = AuthService.get_user_by_id(user_id)
+    user = AuthService.get_current_principal()
+    user_id = user.uid if user else None
     if (user is None):
         return jsonify({"message": "User not found"}), 404
     if AuthService.login_user(user.email, data.get('old_password'))[0] is None:
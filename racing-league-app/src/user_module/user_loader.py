@@ -0,0 +1,64 @@
+from flask import g, has_request_context
+from src.user_module.user import User
+
+
+class UserLoader:
+    """
+    Request-scoped identity map for User objects.
+
+    The loader lives on flask.g, so every serializer and model working on the
+    same request shares it and each email hits MongoDB at most once per request.
+    Outside of a request (scripts, background jobs) a throwaway loader is used.
+    """
+
+    def __init__(self):
+        self._users = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def current():
+        """Get the loader bound to the current request"""
+        if not has_request_context():
+            return UserLoader()
+        loader = g.get('user_loader')
+        if loader is None:
+            loader = UserLoader()
+            g.user_loader = loader
+        return loader
+
+    def load(self, email):
+        """Get a single user by email, or None if it does not exist"""
+        return self.load_many([email]).get(email)
+
+    def load_many(self, emails):
+        """
+        Get several users by email with at most one query for the unseen ones
+
+        Returns:
+            Dict mapping emails to User objects; unknown emails are omitted
+        """
+        emails = {email for email in emails if email}
+        missing = [email for email in emails if email not in self._users]
+        self.hits += len(emails) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            found = User.get_users_by_mails(missing)
+            for email in missing:
+                # Remember unknown emails too, so they are not queried again
+                self._users[email] = found.get(email)
+
+        return {email: self._users[email] for email in emails if self._users[email] is not None}
+
+    def prime(self, user):
+        """Add an already loaded user to the map"""
+        if user:
+            self._users[user.email] = user
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._users)
+        }
@@ -7,13 +7,13 @@ class UserService:
 
     @staticmethod
     def get_next_race_of_user(email):
-        user = User.get_user_by_mail(email)
-        if user:
-            leagues = user.leagues
-            for league in leagues:
-                league = League.get_league_by_id(league)
-                if league and league.calendar:
-                    # Use the league's get_next_race method which properly handles timezone-aware comparisons
-                    next_race = league.get_next_race()
-                    if next_race:
-                        return next_race
\ No newline at end of file
+        """
+        Get the soonest upcoming race across all leagues of the user
+
+        Returns:
+            Tuple of (League, Race), or (None, None) if the user has no upcoming race
+        """
+        league = League.get_next_race_for_participant(email)
+        if league and league.next_race:
+            return league, league.next_race
+        return None, None
@@ -325,8 +325,16 @@ export const updateUserPassword = async (passwordData: {
  */
 export const fetchPublicLeagues = async (): Promise<League[]> => {
   try {
-    const response = await api.get('/v1/leagues/all');
-    return response.data;
+    // The listing is cursor-paginated; follow next_cursor until the last page
+    const leagues: League[] = [];
+    let cursor: string | null = null;
+    do {
+      const response: { data: { leagues: League[]; next_cursor: string | null } } =
+        await api.get('/v1/leagues/all', { params: cursor ? { cursor } : {} });
+      leagues.push(...response.data.leagues);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return leagues;
   } catch (error) {
     console.error('Error fetching public leagues:', error);
     throw error;